@@ -1,3 +1,8 @@
 from django.contrib import admin
+from .models import DailyItemSales, DailySales, DataVersion, HourlySales, SalesForecast
 
-# Register your models here.
+admin.site.register(DailySales)
+admin.site.register(DailyItemSales)
+admin.site.register(HourlySales)
+admin.site.register(SalesForecast)
+admin.site.register(DataVersion)
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.models import Business
+from analytics_engine.services.forecasting import fit_business_forecast
+
+
+class Command(BaseCommand):
+    help = "Fit the daily revenue forecasts (all businesses by default); run daily"
+
+    def add_arguments(self, parser):
+        parser.add_argument("business_ids", nargs="*", type=int)
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Refit even when no bill changed since the last fit",
+        )
+
+    def handle(self, *args, **options):
+        businesses = Business.objects.all()
+        if options["business_ids"]:
+            businesses = businesses.filter(id__in=options["business_ids"])
+            if not businesses.exists():
+                raise CommandError("No matching businesses found")
+
+        for business in businesses:
+            forecast = fit_business_forecast(business, force=options["force"])
+            if forecast is None:
+                self.stdout.write(f"{business.name}: not enough sales history, skipped")
+                continue
+
+            params = forecast.params
+            self.stdout.write(self.style.SUCCESS(
+                f"{business.name}: fitted on days to {forecast.history_end} "
+                f"(alpha={params['alpha']}, beta={params['beta']}, "
+                f"gamma={params['gamma']}, phi={params['phi']})"
+            ))
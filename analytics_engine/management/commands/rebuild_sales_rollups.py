@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.models import Business
+from analytics_engine.services.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Recompute the daily and hourly sales rollups from bills (all businesses by default)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("business_ids", nargs="*", type=int)
+
+    def handle(self, *args, **options):
+        businesses = Business.objects.all()
+        if options["business_ids"]:
+            businesses = businesses.filter(id__in=options["business_ids"])
+            if not businesses.exists():
+                raise CommandError("No matching businesses found")
+
+        for business in businesses:
+            days = rebuild_rollups(business)
+            self.stdout.write(self.style.SUCCESS(f"{business.name}: {days} days rebuilt"))
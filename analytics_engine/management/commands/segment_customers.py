@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.models import Business
+from analytics_engine.services.rfm import segment_customers
+
+
+class Command(BaseCommand):
+    help = "Refresh the RFM scores and segments of customers (all businesses by default); run daily"
+
+    def add_arguments(self, parser):
+        parser.add_argument("business_ids", nargs="*", type=int)
+
+    def handle(self, *args, **options):
+        businesses = Business.objects.all()
+        if options["business_ids"]:
+            businesses = businesses.filter(id__in=options["business_ids"])
+            if not businesses.exists():
+                raise CommandError("No matching businesses found")
+
+        for business in businesses:
+            changed = segment_customers(business)
+            self.stdout.write(self.style.SUCCESS(f"{business.name}: {changed} customers updated"))
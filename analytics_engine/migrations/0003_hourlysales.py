@@ -0,0 +1,52 @@
+# Generated by Django 6.0 on 2026-10-18 19:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0005_business_upi_id"),
+        ("analytics_engine", "0002_dataversion"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="HourlySales",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("hour", models.PositiveSmallIntegerField()),
+                ("bill_count", models.IntegerField(default=0)),
+                (
+                    "revenue",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                (
+                    "business",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="hourly_sales",
+                        to="accounts.business",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["date", "hour"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("business", "date", "hour"), name="unique_hourly_sales"
+                    )
+                ],
+            },
+        ),
+    ]
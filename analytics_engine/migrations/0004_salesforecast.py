@@ -0,0 +1,43 @@
+# Generated by Django 6.0 on 2026-10-18 19:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0005_business_upi_id"),
+        ("analytics_engine", "0003_hourlysales"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SalesForecast",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("data_version", models.PositiveBigIntegerField(default=0)),
+                ("history_end", models.DateField()),
+                ("params", models.JSONField(default=dict)),
+                ("history", models.JSONField(default=list)),
+                ("forecast", models.JSONField(default=list)),
+                ("fitted_at", models.DateTimeField(auto_now=True)),
+                (
+                    "business",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="sales_forecast",
+                        to="accounts.business",
+                    ),
+                ),
+            ],
+        ),
+    ]
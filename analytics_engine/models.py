@@ -1,3 +1,144 @@
 from django.db import models
 
-# Create your models here.
+from accounts.models import Business
+
+
+class DailySales(models.Model):
+    """
+    Per-business, per-day totals of non-deleted bills. Kept up to date by
+    ``analytics_engine.services.rollups`` whenever bills are written, and
+    rebuilt from scratch by ``rebuild_sales_rollups``.
+    """
+
+    business = models.ForeignKey(
+        Business,
+        on_delete=models.CASCADE,
+        related_name="daily_sales",
+    )
+    date = models.DateField()
+
+    bill_count = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    discount_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    paid_count = models.IntegerField(default=0)
+    paid_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    unpaid_count = models.IntegerField(default=0)
+    unpaid_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    pay_later_count = models.IntegerField(default=0)
+    pay_later_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    high_value_count = models.IntegerField(default=0)
+    item_quantity = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ["date"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["business", "date"],
+                name="unique_daily_sales",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.business} {self.date}: {self.revenue}"
+
+
+class DailyItemSales(models.Model):
+    business = models.ForeignKey(
+        Business,
+        on_delete=models.CASCADE,
+        related_name="daily_item_sales",
+    )
+    date = models.DateField()
+    item_name = models.CharField(max_length=255)
+
+    quantity = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["business", "date", "item_name"],
+                name="unique_daily_item_sales",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.business} {self.date} {self.item_name}: {self.quantity}"
+
+
+class HourlySales(models.Model):
+    """
+    Per-business totals for each local hour with bills. Every calendar and
+    time-of-day grouping (hour, weekday, week, quarter, ...) is derived
+    from these rows, so no grouping has to scan bills.
+    """
+
+    business = models.ForeignKey(
+        Business,
+        on_delete=models.CASCADE,
+        related_name="hourly_sales",
+    )
+    date = models.DateField()
+    hour = models.PositiveSmallIntegerField()
+
+    bill_count = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        ordering = ["date", "hour"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["business", "date", "hour"],
+                name="unique_hourly_sales",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.business} {self.date} {self.hour:02d}h: {self.revenue}"
+
+
+class DataVersion(models.Model):
+    """
+    Per-business counter bumped on every bill write that changes analytics.
+    Cached analytics results are keyed by it, so they never go stale.
+    """
+
+    business = models.OneToOneField(
+        Business,
+        on_delete=models.CASCADE,
+        related_name="data_version",
+    )
+    version = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.business} v{self.version}"
+
+
+class SalesForecast(models.Model):
+    """
+    Latest daily revenue forecast of a business with the fitted smoothing
+    parameters, written by ``fit_sales_forecasts``. Pages only read it;
+    nothing is fitted on request.
+    """
+
+    business = models.OneToOneField(
+        Business,
+        on_delete=models.CASCADE,
+        related_name="sales_forecast",
+    )
+
+    # Data version and last complete day the model was fitted on; the
+    # command refits only when either moved.
+    data_version = models.PositiveBigIntegerField(default=0)
+    history_end = models.DateField()
+
+    params = models.JSONField(default=dict)
+    history = models.JSONField(default=list)
+    forecast = models.JSONField(default=list)
+
+    fitted_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.business} forecast from {self.history_end}"
@@ -0,0 +1,46 @@
+import hashlib
+import json
+
+from django.core.cache import caches
+
+from analytics_engine.models import DataVersion
+
+CACHE_ALIAS = "analytics"
+
+# Entries are never served stale because the data version is part of the
+# key; the timeout only bounds how long superseded entries take up space.
+CACHE_TIMEOUT = 24 * 60 * 60
+
+
+def data_version(business):
+    return (
+        DataVersion.objects
+        .filter(business=business)
+        .values_list("version", flat=True)
+        .first()
+    ) or 0
+
+
+def cache_key(business, version, name, params):
+    digest = hashlib.sha1(
+        json.dumps(params, sort_keys=True, default=str).encode()
+    ).hexdigest()
+    return f"analytics:{business.id}:{version}:{name}:{digest}"
+
+
+def cached_result(business, name, compute, **params):
+    """
+    Return ``compute()`` for ``business``, reusing the cached value as long
+    as none of its bills changed. ``params`` must identify everything else
+    the result depends on, such as the date range or today's date. The
+    result must be picklable, so evaluate querysets before returning them.
+    """
+    cache = caches[CACHE_ALIAS]
+    key = cache_key(business, data_version(business), name, params)
+
+    result = cache.get(key)
+    if result is None:
+        result = compute()
+        cache.set(key, result, CACHE_TIMEOUT)
+
+    return result
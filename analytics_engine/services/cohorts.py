@@ -0,0 +1,103 @@
+import numpy as np
+from django.utils import timezone
+
+from analytics_engine.services.utils.date_ranges import business_timezone
+from billing.models import Bill
+
+# Rows fetched per round trip while loading bills.
+LOAD_CHUNK_SIZE = 5000
+
+# Most recent cohorts, and months after the first purchase, shown.
+MAX_COHORTS = 12
+MAX_PERIODS = 12
+
+
+def load_customer_months(business, chunk_size=LOAD_CHUNK_SIZE):
+    """
+    ``(customer_ids, months)`` arrays over the live bills of ``business``
+    that have a customer; months count local calendar months since 1970-01.
+    """
+    tz = business_timezone(business)
+    rows = (
+        Bill.objects
+        .filter(business=business, is_deleted=False, customer__isnull=False)
+        .order_by()
+        .values_list("customer_id", "created_at")
+        .iterator(chunk_size=chunk_size)
+    )
+
+    customers, months = [], []
+    for customer_id, created_at in rows:
+        local = created_at.astimezone(tz)
+        customers.append(customer_id)
+        months.append(local.year * 12 + local.month - 1 - 1970 * 12)
+
+    return np.array(customers, dtype=np.int64), np.array(months, dtype=np.int64)
+
+
+def retention_matrix(customer_ids, months):
+    """
+    Cohort x period counts of active customers. A customer's cohort is the
+    month of their first bill; period n counts them if they billed in the
+    n-th month after it. Returns ``(first_month, counts)``, where row i of
+    ``counts`` is the cohort ``first_month + i``.
+    """
+    if not len(months):
+        return 0, np.zeros((0, 0), dtype=np.int64)
+
+    customers, codes = np.unique(customer_ids, return_inverse=True)
+    first = np.full(len(customers), months.max())
+    np.minimum.at(first, codes, months)
+
+    periods = months - first[codes]
+    size = int(months.max() - months.min() + 1)
+
+    # Each customer counts once per period, however many bills they have.
+    active = np.unique(codes * size + periods)
+    active_codes, active_periods = np.divmod(active, size)
+    cells = (first[active_codes] - months.min()) * size + active_periods
+
+    counts = np.bincount(cells, minlength=size * size).reshape(size, size)
+    return int(months.min()), counts
+
+
+def cohort_retention(business, today=None, max_cohorts=MAX_COHORTS, max_periods=MAX_PERIODS):
+    """
+    Chart-ready retention of the monthly cohorts of the last ``max_cohorts``
+    months up to ``today`` (the local date by default): their labels,
+    sizes and, per period, the returning customers and their percentage.
+    Periods after the current month are None; months without bills since
+    the last one count as 0%.
+    """
+    today = today or timezone.localdate()
+    current_month = today.year * 12 + today.month - 1 - 1970 * 12
+    first_month, counts = retention_matrix(*load_customer_months(business))
+    if not len(counts):
+        return {"periods": list(range(max_periods)), "cohorts": []}
+
+    # Extend the period axis to the current month, with no activity after
+    # the last month that has bills.
+    size = max(current_month - first_month + 1, len(counts))
+    counts = np.pad(counts, ((0, size - len(counts)), (0, size - len(counts))))
+    elapsed = current_month - first_month - np.arange(size)
+
+    rows = []
+    for cohort in range(max(0, size - max_cohorts), size):
+        customers = int(counts[cohort, 0])
+        if not customers:
+            continue
+        periods = counts[cohort, :max(0, min(elapsed[cohort] + 1, max_periods))]
+        rows.append({
+            "label": str(np.datetime64(first_month + cohort, "M")),
+            "customers": customers,
+            "periods": [
+                {
+                    "customers": int(active),
+                    "share": round(int(active) / customers, 3),
+                    "percent": round(100 * int(active) / customers, 1),
+                }
+                for active in periods
+            ] + [None] * (max_periods - len(periods)),
+        })
+
+    return {"periods": list(range(max_periods)), "cohorts": rows}
@@ -0,0 +1,149 @@
+import calendar
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db.models import Q, Sum
+
+from analytics_engine.services.rollups import daily_sales
+
+# What the current window is compared against: the window of the same
+# length right before it, or the same dates whole weeks, months or years
+# back. The shift is one week, month or year, or as many as it takes for
+# the two windows not to overlap.
+COMPARISONS = {
+    "previous": "Previous period",
+    "week": "Week over week",
+    "month": "Month over month",
+    "year": "Year over year",
+}
+
+METRICS = ("revenue", "bill_count", "avg_ticket", "paid_ratio")
+
+
+def _shift_months(day, months):
+    """``day`` moved by ``months``, clamped to the end of shorter months."""
+    month_index = day.year * 12 + day.month - 1 + months
+    year, month = divmod(month_index, 12)
+    month += 1
+    return date(year, month, min(day.day, calendar.monthrange(year, month)[1]))
+
+
+def comparison_shift(from_date, to_date, comparison):
+    """
+    How many weeks, months or years ``comparison`` moves the window back:
+    the fewest that end the previous window before ``from_date``.
+    """
+    if comparison == "week":
+        return -(-((to_date - from_date).days + 1) // 7)
+
+    months = 1 if comparison == "month" else 12
+    shift = 1
+    while _shift_months(to_date, -months * shift) >= from_date:
+        shift += 1
+    return shift
+
+
+def previous_window(from_date, to_date, comparison="previous"):
+    """
+    ``(from_date, to_date)`` of the window ``from_date..to_date`` is compared
+    with. It never overlaps ``from_date..to_date``.
+    """
+    if comparison not in COMPARISONS:
+        raise ValueError(f"Unknown comparison '{comparison}'")
+
+    length = (to_date - from_date).days + 1
+    if comparison == "previous":
+        return from_date - timedelta(days=length), from_date - timedelta(days=1)
+
+    shift = comparison_shift(from_date, to_date, comparison)
+    if comparison == "week":
+        return from_date - timedelta(weeks=shift), to_date - timedelta(weeks=shift)
+
+    months = shift * (1 if comparison == "month" else 12)
+    return _shift_months(from_date, -months), _shift_months(to_date, -months)
+
+
+@dataclass(frozen=True)
+class PeriodTotals:
+    from_date: date
+    to_date: date
+    revenue: Decimal
+    bill_count: int
+    paid_count: int
+
+    @property
+    def avg_ticket(self):
+        return self.revenue / self.bill_count if self.bill_count else Decimal("0")
+
+    @property
+    def paid_ratio(self):
+        return self.paid_count / self.bill_count if self.bill_count else 0
+
+
+@dataclass(frozen=True)
+class PeriodComparison:
+    comparison: str
+    current: PeriodTotals
+    previous: PeriodTotals
+
+    @property
+    def label(self):
+        return COMPARISONS[self.comparison]
+
+    @property
+    def shift_label(self):
+        """How far back the previous window is, e.g. "5 weeks earlier"."""
+        if self.comparison == "previous":
+            return "the period right before"
+        shift = comparison_shift(self.current.from_date, self.current.to_date, self.comparison)
+        return f"{shift} {self.comparison}{'s' if shift > 1 else ''} earlier"
+
+    @property
+    def changes(self):
+        """Percent change of every metric; None where the previous value is zero."""
+        changes = {}
+        for metric in METRICS:
+            current = getattr(self.current, metric)
+            previous = getattr(self.previous, metric)
+            changes[metric] = round(float((current - previous) / previous) * 100, 1) if previous else None
+        return changes
+
+
+def compare_periods(business, from_date, to_date, comparison="previous"):
+    """
+    Totals of ``from_date..to_date`` against the window chosen by
+    ``comparison``, both read from the DailySales rollup in one query.
+    """
+    previous_from, previous_to = previous_window(from_date, to_date, comparison)
+    windows = {
+        "current": Q(date__range=(from_date, to_date)),
+        "previous": Q(date__range=(previous_from, previous_to)),
+    }
+
+    aggregates = {}
+    for name, window in windows.items():
+        aggregates[f"{name}_revenue"] = Sum("revenue", filter=window, default=Decimal("0"))
+        aggregates[f"{name}_bill_count"] = Sum("bill_count", filter=window, default=0)
+        aggregates[f"{name}_paid_count"] = Sum("paid_count", filter=window, default=0)
+
+    totals = (
+        daily_sales(business)
+        .filter(windows["current"] | windows["previous"])
+        .aggregate(**aggregates)
+    )
+
+    def period(name, start, end):
+        return PeriodTotals(
+            from_date=start,
+            to_date=end,
+            revenue=totals[f"{name}_revenue"],
+            bill_count=totals[f"{name}_bill_count"],
+            paid_count=totals[f"{name}_paid_count"],
+        )
+
+    return PeriodComparison(
+        comparison=comparison,
+        current=period("current", from_date, to_date),
+        previous=period("previous", previous_from, previous_to),
+    )
@@ -0,0 +1,186 @@
+from datetime import timedelta
+
+import numpy as np
+from django.utils import timezone
+
+from analytics_engine.models import SalesForecast
+from analytics_engine.services.cache import data_version
+from analytics_engine.services.rollups import daily_sales
+
+# Additive Holt-Winters with a damped trend and a weekly season, written in
+# error-correction form (ETS(A,Ad,A)):
+#
+#   e = y - (level + phi * trend + season)
+#   level  += phi * trend + alpha * e
+#   trend   = phi * trend + beta * e
+#   season += gamma * e
+#
+# Parameters are chosen by grid search on the one-step squared error; every
+# grid point is run at once as a vector, so a fit is one pass over the days.
+
+SEASON_LENGTH = 7
+HORIZONS = (7, 30)
+HISTORY_DAYS = 365
+HISTORY_SHOWN = 28
+
+# Two full seasons to initialise from, and at least one more to fit on.
+MIN_HISTORY_DAYS = 3 * SEASON_LENGTH
+
+ALPHAS = (0.05, 0.1, 0.2, 0.3, 0.5, 0.7)
+BETAS = (0.0, 0.01, 0.05, 0.1)
+GAMMAS = (0.01, 0.05, 0.1, 0.2, 0.3)
+PHIS = (0.9, 0.98)
+
+# Two-sided 95% interval.
+INTERVAL_Z = 1.96
+
+
+def _parameter_grid():
+    alpha, beta, gamma, phi = (
+        grid.ravel() for grid in np.meshgrid(ALPHAS, BETAS, GAMMAS, PHIS, indexing="ij")
+    )
+    # The usual admissible region: trend and season adapt slower than level.
+    valid = (beta <= alpha) & (gamma <= 1 - alpha)
+    return alpha[valid], beta[valid], gamma[valid], phi[valid]
+
+
+def _initial_state(y, m):
+    first, second = y[:m].mean(), y[m:2 * m].mean()
+    return first, (second - first) / m, y[:m] - first
+
+
+def fit_holt_winters(y, m=SEASON_LENGTH):
+    """
+    Fit ``y`` (daily values, oldest first) and return the best parameters
+    with the final level, trend and season and the one-step error sigma.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    alpha, beta, gamma, phi = _parameter_grid()
+    size = len(alpha)
+
+    level0, trend0, season0 = _initial_state(y, m)
+    level = np.full(size, level0)
+    trend = np.full(size, trend0)
+    season = np.tile(season0, (size, 1))
+    sse = np.zeros(size)
+
+    for t in range(m, len(y)):
+        slot = t % m
+        error = y[t] - (level + phi * trend + season[:, slot])
+        level = level + phi * trend + alpha * error
+        trend = phi * trend + beta * error
+        season[:, slot] += gamma * error
+        sse += error ** 2
+
+    best = int(np.argmin(sse))
+    fitted = len(y) - m
+    return {
+        "alpha": float(alpha[best]),
+        "beta": float(beta[best]),
+        "gamma": float(gamma[best]),
+        "phi": float(phi[best]),
+        "level": float(level[best]),
+        "trend": float(trend[best]),
+        # Rotated so index 0 is the season of the day after the history.
+        "season": np.roll(season[best], -(len(y) % m)).tolist(),
+        "sigma": float(np.sqrt(sse[best] / fitted)),
+    }
+
+
+def forecast_holt_winters(params, horizon):
+    """``(mean, lower, upper)`` arrays for the next ``horizon`` days."""
+    steps = np.arange(1, horizon + 1)
+    phi = params["phi"]
+    damped = np.cumsum(phi ** steps)
+    season = np.asarray(params["season"])
+    m = len(season)
+
+    mean = params["level"] + damped * params["trend"] + season[(steps - 1) % m]
+
+    # h-step variance: sigma^2 * (1 + sum over j < h of c_j^2), with
+    # c_j = alpha + beta * (phi + ... + phi^j) + gamma * [j is a whole season].
+    c = params["alpha"] + params["beta"] * damped + params["gamma"] * (steps % m == 0)
+    variance = params["sigma"] ** 2 * (1 + np.concatenate(([0.0], np.cumsum(c[:-1] ** 2))))
+    spread = INTERVAL_Z * np.sqrt(variance)
+
+    # Revenue cannot go negative.
+    return np.maximum(mean, 0), np.maximum(mean - spread, 0), np.maximum(mean + spread, 0)
+
+
+def daily_revenue(business, from_date, to_date):
+    """Revenue of every day ``from_date..to_date`` as an array, zeros included."""
+    values = np.zeros((to_date - from_date).days + 1)
+    for day, revenue in daily_sales(business, from_date, to_date).values_list("date", "revenue"):
+        values[(day - from_date).days] = float(revenue)
+    return values
+
+
+def _points(start, values, lower=None, upper=None):
+    points = []
+    for offset, value in enumerate(values):
+        point = {"date": (start + timedelta(days=offset)).isoformat(), "value": round(float(value), 2)}
+        if lower is not None:
+            point["lower"] = round(float(lower[offset]), 2)
+            point["upper"] = round(float(upper[offset]), 2)
+        points.append(point)
+    return points
+
+
+def fit_business_forecast(business, today=None, force=False):
+    """
+    Fit on the complete days before ``today`` and store the forecast.
+    Returns the SalesForecast, or None when there is too little history.
+    Skips the fit when neither the bills nor the last day have changed
+    since the stored one, unless ``force``.
+    """
+    today = today or timezone.localdate()
+    history_end = today - timedelta(days=1)
+    version = data_version(business)
+
+    existing = SalesForecast.objects.filter(business=business).first()
+    if existing and not force and existing.data_version == version and existing.history_end == history_end:
+        return existing
+
+    first_day = daily_sales(business).filter(bill_count__gt=0).values_list("date", flat=True).first()
+    if first_day is None:
+        return None
+
+    history_start = max(first_day, history_end - timedelta(days=HISTORY_DAYS - 1))
+    y = daily_revenue(business, history_start, history_end)
+    if len(y) < MIN_HISTORY_DAYS:
+        return None
+
+    params = fit_holt_winters(y)
+    mean, lower, upper = forecast_holt_winters(params, max(HORIZONS))
+    shown = y[-HISTORY_SHOWN:]
+
+    forecast, _ = SalesForecast.objects.update_or_create(
+        business=business,
+        defaults={
+            "data_version": version,
+            "history_end": history_end,
+            "params": params,
+            "history": _points(history_end - timedelta(days=len(shown) - 1), shown),
+            "forecast": _points(today, mean, lower, upper),
+        },
+    )
+    return forecast
+
+
+def get_forecast(business, horizon=7):
+    """
+    Stored forecast of ``business`` cut to ``horizon`` days, or None.
+    Only reads; forecasts are fitted by ``fit_sales_forecasts``.
+    """
+    forecast = SalesForecast.objects.filter(business=business).first()
+    if forecast is None:
+        return None
+
+    points = forecast.forecast[:horizon]
+    return {
+        "fitted_at": forecast.fitted_at,
+        "history_end": forecast.history_end,
+        "history": forecast.history,
+        "forecast": points,
+        "total": round(sum(point["value"] for point in points), 2),
+    }
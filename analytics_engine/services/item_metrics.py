@@ -1,15 +1,15 @@
 from django.db.models import Sum
-from billing.models import BillItem
 
 
-def get_top_items(bills, limit=5):
+def get_top_items(item_days, limit=5):
+    """Best sellers by revenue, from the DailyItemSales rollup."""
     return (
-        BillItem.objects
-        .filter(bill__in=bills)
+        item_days
         .values("item_name")
         .annotate(
             qty=Sum("quantity"),
-            revenue=Sum("total"),
+            revenue=Sum("revenue"),
         )
+        .filter(qty__gt=0)
         .order_by("-revenue")[:limit]
     )
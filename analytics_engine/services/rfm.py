@@ -0,0 +1,96 @@
+import numpy as np
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from billing.models import Customer
+
+SCORE_LEVELS = 5
+
+# First match wins; scores are 1 (worst) to 5 (best).
+SEGMENTS = (
+    ("Champions", lambda r, f: (r >= 4) & (f >= 4)),
+    ("Loyal", lambda r, f: (r >= 3) & (f >= 3)),
+    ("New", lambda r, f: (r >= 4) & (f <= 2)),
+    ("At risk", lambda r, f: (r <= 2) & (f >= 3)),
+    ("Lost", lambda r, f: (r <= 1) & (f <= 2)),
+)
+DEFAULT_SEGMENT = "Needs attention"
+
+SCORE_FIELDS = ["recency_score", "frequency_score", "monetary_score", "segment"]
+
+
+def quantile_scores(values):
+    """
+    1..5 score of every value by its rank among ``values``; higher values
+    score higher and equal values score the same.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if not len(values):
+        return np.zeros(0, dtype=np.int64)
+    # Ties take the middle of their ranks, so a large group of equal values
+    # (e.g. one-time buyers) is not all scored as its highest member.
+    ordered = np.sort(values)
+    below = np.searchsorted(ordered, values, side="left")
+    at_or_below = np.searchsorted(ordered, values, side="right")
+    share = (below + at_or_below) / (2 * len(values))
+    return np.clip(np.ceil(share * SCORE_LEVELS), 1, SCORE_LEVELS).astype(np.int64)
+
+
+def rfm_segments(recency_scores, frequency_scores):
+    conditions = [match(recency_scores, frequency_scores) for _, match in SEGMENTS]
+    return np.select(conditions, [name for name, _ in SEGMENTS], default=DEFAULT_SEGMENT)
+
+
+def segment_customers(business, now=None):
+    """
+    Score every customer of ``business`` with bills on recency (days since
+    the last bill), frequency (bill count) and monetary value (total spent)
+    in one vectorized pass over the customer totals, and save the rows
+    whose scores or segment changed. Returns how many were saved.
+    """
+    now = now or timezone.now()
+
+    # Customers whose bills were all deleted drop out of every segment.
+    Customer.objects.filter(business=business, bill_count=0).exclude(segment="").update(
+        recency_score=None, frequency_score=None, monetary_score=None, segment="",
+    )
+
+    customers = list(
+        Customer.objects
+        .filter(business=business, bill_count__gt=0)
+        .only("id", "bill_count", "total_spent", "last_bill_at", *SCORE_FIELDS)
+    )
+    if not customers:
+        return 0
+
+    recency_days = np.array([(now - customer.last_bill_at).days for customer in customers])
+    frequency = np.array([customer.bill_count for customer in customers])
+    monetary = np.array([customer.total_spent for customer in customers], dtype=np.float64)
+
+    # Fewer days since the last bill is better, so rank the negation.
+    recency_scores = quantile_scores(-recency_days)
+    frequency_scores = quantile_scores(frequency)
+    monetary_scores = quantile_scores(monetary)
+    segments = rfm_segments(recency_scores, frequency_scores)
+
+    changed = []
+    for customer, r, f, m, segment in zip(customers, recency_scores, frequency_scores, monetary_scores, segments):
+        scores = (int(r), int(f), int(m), str(segment))
+        if scores != tuple(getattr(customer, field) for field in SCORE_FIELDS):
+            customer.recency_score, customer.frequency_score, customer.monetary_score, customer.segment = scores
+            changed.append(customer)
+
+    Customer.objects.bulk_update(changed, SCORE_FIELDS, batch_size=1000)
+    return len(changed)
+
+
+def segment_summary(business):
+    """Customer count and total spent per segment, largest segment first."""
+    return list(
+        Customer.objects
+        .filter(business=business, bill_count__gt=0)
+        .exclude(segment="")
+        .values("segment")
+        .annotate(customers=Count("id"), revenue=Sum("total_spent"))
+        .order_by("-customers")
+    )
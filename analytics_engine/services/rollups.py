@@ -0,0 +1,307 @@
+from decimal import Decimal
+
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import ExtractHour, TruncDate
+from django.utils import timezone
+
+from analytics_engine.models import DailyItemSales, DailySales, DataVersion, HourlySales
+from analytics_engine.services.utils.date_ranges import business_timezone
+from billing.models import Bill, BillItem
+
+HIGH_VALUE_AMOUNT = Decimal("5000")
+
+ZERO = Decimal("0")
+
+
+def _status_count(status):
+    return Count("id", filter=Q(payment_status=status))
+
+
+def _status_amount(status):
+    return Sum("total_amount", filter=Q(payment_status=status), default=ZERO)
+
+
+def _day_totals(bills):
+    """One row per (business, local day) of ``bills`` with every rollup column."""
+    return (
+        bills.order_by()
+        .annotate(day=TruncDate("created_at", tzinfo=business_timezone()))
+        .values("business_id", "day")
+        .annotate(
+            bill_count=Count("id"),
+            revenue=Sum("total_amount", default=ZERO),
+            discount_total=Sum("discount", default=ZERO),
+            paid_count=_status_count("PAID"),
+            paid_amount=_status_amount("PAID"),
+            unpaid_count=_status_count("UNPAID"),
+            unpaid_amount=_status_amount("UNPAID"),
+            pay_later_count=_status_count("PAY_LATER"),
+            pay_later_amount=_status_amount("PAY_LATER"),
+            high_value_count=Count("id", filter=Q(total_amount__gte=HIGH_VALUE_AMOUNT)),
+        )
+    )
+
+
+def _hour_totals(bills):
+    """One row per (business, local day, local hour) of ``bills``."""
+    tz = business_timezone()
+    return (
+        bills.order_by()
+        .annotate(day=TruncDate("created_at", tzinfo=tz), hour=ExtractHour("created_at", tzinfo=tz))
+        .values("business_id", "day", "hour")
+        .annotate(bill_count=Count("id"), revenue=Sum("total_amount", default=ZERO))
+    )
+
+
+def _item_totals(bills):
+    """One row per (business, local day, item name) of the items of ``bills``."""
+    return (
+        BillItem.objects
+        .filter(bill__in=bills.order_by().values("id"))
+        .annotate(day=TruncDate("bill__created_at", tzinfo=business_timezone()))
+        .values("bill__business_id", "day", "item_name")
+        .annotate(quantity=Sum("quantity"), revenue=Sum("total"))
+    )
+
+
+def _split(row, *keys):
+    values = dict(row)
+    return {key: values.pop(key) for key in keys}, values
+
+
+# Value columns written per table, in the order they are inserted.
+DAY_FIELDS = [
+    "bill_count", "revenue", "discount_total",
+    "paid_count", "paid_amount", "unpaid_count", "unpaid_amount",
+    "pay_later_count", "pay_later_amount",
+    "high_value_count", "item_quantity",
+]
+HOUR_FIELDS = ["bill_count", "revenue"]
+ITEM_FIELDS = ["quantity", "revenue"]
+
+STATUS_FIELDS = {"PAID": "paid", "UNPAID": "unpaid", "PAY_LATER": "pay_later"}
+
+# Rows per INSERT statement, well under SQLite's bound-parameter limit.
+UPSERT_BATCH_SIZE = 50
+
+
+def _add(model, key, values):
+    """Add ``values`` onto the rollup row for ``key``, creating it if missing."""
+    changes = {field: F(field) + value for field, value in values.items()}
+
+    if model.objects.filter(**key).update(**changes):
+        return
+
+    try:
+        with transaction.atomic():
+            model.objects.create(**key, **values)
+    except IntegrityError:
+        # Another writer created the row first; add onto theirs.
+        model.objects.filter(**key).update(**changes)
+
+
+def _upsert(model, key_fields, value_fields, rows):
+    """
+    Add each ``{key tuple: {field: delta}}`` of ``rows`` onto its rollup row
+    with ``INSERT ... ON CONFLICT DO UPDATE SET col = col + excluded.col``,
+    one statement per batch. Backends without it fall back to ``_add``.
+    """
+    if not rows:
+        return
+
+    if not connection.features.supports_update_conflicts_with_target:
+        attnames = [model._meta.get_field(name).attname for name in key_fields]
+        for key, values in rows.items():
+            _add(model, dict(zip(attnames, key)), values)
+        return
+
+    quote = connection.ops.quote_name
+    table = quote(model._meta.db_table)
+    fields = [model._meta.get_field(name) for name in (*key_fields, *value_fields)]
+    columns = ", ".join(quote(field.column) for field in fields)
+    conflict = ", ".join(quote(model._meta.get_field(name).column) for name in key_fields)
+    updates = ", ".join(
+        f"{quote(column)} = {table}.{quote(column)} + excluded.{quote(column)}"
+        for column in (model._meta.get_field(name).column for name in value_fields)
+    )
+    row_placeholder = f"({', '.join(['%s'] * len(fields))})"
+
+    items = list(rows.items())
+    with connection.cursor() as cursor:
+        for start in range(0, len(items), UPSERT_BATCH_SIZE):
+            batch = items[start:start + UPSERT_BATCH_SIZE]
+            params = []
+            for key, values in batch:
+                row = (*key, *(values.get(name, 0) for name in value_fields))
+                params.extend(field.get_db_prep_save(value, connection) for field, value in zip(fields, row))
+            cursor.execute(
+                f"INSERT INTO {table} ({columns}) VALUES {', '.join([row_placeholder] * len(batch))} "
+                f"ON CONFLICT ({conflict}) DO UPDATE SET {updates}",
+                params,
+            )
+
+
+def bump_data_version(*business_ids):
+    rows = {(business_id,): {"version": 1} for business_id in business_ids}
+    _upsert(DataVersion, ["business"], ["version"], rows)
+
+
+def _accumulate(table, key, values, sign):
+    row = table.setdefault(key, {})
+    for field, value in values.items():
+        row[field] = row.get(field, 0) + sign * value
+
+
+def _collect(deltas, bills, items, sign):
+    """Add the rollup deltas of live ``bills`` and their ``items`` to ``deltas``."""
+    days, hours, item_rows = deltas
+    tz = business_timezone()
+    bill_days = {}
+
+    for bill in bills:
+        if bill.is_deleted:
+            continue
+        local = timezone.localtime(bill.created_at, tz)
+        day = (bill.business_id, local.date())
+        bill_days[bill.pk] = day
+
+        values = {
+            "bill_count": 1,
+            "revenue": bill.total_amount,
+            "discount_total": bill.discount,
+            "high_value_count": int(bill.total_amount >= HIGH_VALUE_AMOUNT),
+        }
+        status = STATUS_FIELDS.get(bill.payment_status)
+        if status:
+            values[f"{status}_count"] = 1
+            values[f"{status}_amount"] = bill.total_amount
+        _accumulate(days, day, values, sign)
+        _accumulate(hours, (*day, local.hour), {"bill_count": 1, "revenue": bill.total_amount}, sign)
+
+    for item in items:
+        day = bill_days.get(item.bill_id)
+        if day is None:
+            continue
+        _accumulate(item_rows, (*day, item.item_name), {"quantity": item.quantity, "revenue": item.total}, sign)
+        _accumulate(days, day, {"item_quantity": item.quantity}, sign)
+
+
+def _items_of(bills):
+    return list(
+        BillItem.objects
+        .filter(bill_id__in=[bill.pk for bill in bills])
+        .only("bill_id", "item_name", "quantity", "total")
+    )
+
+
+def _record(*changes):
+    """
+    Apply ``(bills, items, sign)`` changes to the rollups: the deltas are
+    summed in Python, then each table gets one upsert per batch of rows.
+    """
+    deltas = ({}, {}, {})
+    for bills, items, sign in changes:
+        _collect(deltas, bills, _items_of(bills) if items is None else items, sign)
+
+    days, hours, item_rows = deltas
+    _upsert(DailyItemSales, ["business", "date", "item_name"], ITEM_FIELDS, item_rows)
+    _upsert(DailySales, ["business", "date"], DAY_FIELDS, days)
+    _upsert(HourlySales, ["business", "date", "hour"], HOUR_FIELDS, hours)
+    bump_data_version(*{business_id for business_id, _ in days})
+
+
+def add_bills(bills, items=None):
+    """
+    Count newly written ``bills`` into the rollups and bump the data
+    version of their business. ``items`` are their BillItems, when already
+    at hand; they are loaded otherwise. Deleted bills are ignored. Call
+    inside the transaction that wrote them.
+    """
+    _record((bills, items, 1))
+
+
+def remove_bills(bills, items=None):
+    """
+    Take ``bills`` out of the rollups, before they are deleted or changed.
+    Call inside the same transaction as the write.
+    """
+    _record((bills, items, -1))
+
+
+def change_bills(old_bills, new_bills):
+    """
+    Swap the contribution of ``old_bills`` for that of ``new_bills``, the
+    same bills after a change that keeps their date and items (such as a
+    payment status change), so their items are not read at all.
+    """
+    _record((old_bills, (), -1), (new_bills, (), 1))
+
+
+@transaction.atomic
+def rebuild_rollups(business):
+    """Recompute every rollup row of ``business`` from its bills."""
+    DailySales.objects.filter(business=business).delete()
+    DailyItemSales.objects.filter(business=business).delete()
+    HourlySales.objects.filter(business=business).delete()
+
+    bills = Bill.objects.filter(business=business, is_deleted=False)
+
+    item_rows = []
+    item_quantities = {}
+    for row in _item_totals(bills):
+        item_quantities[row["day"]] = item_quantities.get(row["day"], 0) + row["quantity"]
+        item_rows.append(DailyItemSales(
+            business=business,
+            date=row["day"],
+            item_name=row["item_name"],
+            quantity=row["quantity"],
+            revenue=row["revenue"],
+        ))
+
+    day_rows = []
+    for row in _day_totals(bills):
+        key, values = _split(row, "business_id", "day")
+        day_rows.append(DailySales(
+            business=business,
+            date=key["day"],
+            item_quantity=item_quantities.get(key["day"], 0),
+            **values,
+        ))
+
+    hour_rows = []
+    for row in _hour_totals(bills):
+        key, values = _split(row, "business_id", "day", "hour")
+        hour_rows.append(HourlySales(
+            business=business,
+            date=key["day"],
+            hour=key["hour"],
+            **values,
+        ))
+
+    DailySales.objects.bulk_create(day_rows, batch_size=1000)
+    DailyItemSales.objects.bulk_create(item_rows, batch_size=1000)
+    HourlySales.objects.bulk_create(hour_rows, batch_size=1000)
+    bump_data_version(business.id)
+
+    return len(day_rows)
+
+
+def _in_range(queryset, from_date=None, to_date=None):
+    if from_date:
+        queryset = queryset.filter(date__gte=from_date)
+    if to_date:
+        queryset = queryset.filter(date__lte=to_date)
+    return queryset
+
+
+def daily_sales(business, from_date=None, to_date=None):
+    return _in_range(DailySales.objects.filter(business=business), from_date, to_date)
+
+
+def daily_item_sales(business, from_date=None, to_date=None):
+    return _in_range(DailyItemSales.objects.filter(business=business), from_date, to_date)
+
+
+def hourly_sales(business, from_date=None, to_date=None):
+    return _in_range(HourlySales.objects.filter(business=business), from_date, to_date)
@@ -1,31 +1,48 @@
-from django.db.models import Sum
-from django.db.models.functions import TruncDate, TruncMonth
-
-
-def get_sales_overview(bills):
-    return {
-        "total_sales": bills.aggregate(Sum("total_amount"))["total_amount__sum"] or 0,
-        "bill_count": bills.count(),
-        "paid": bills.filter(payment_status="PAID").count(),
-        "unpaid": bills.exclude(payment_status="PAID").count(),
-    }
-
-
-def get_sales_by_day(bills):
-    return (
-        bills
-        .annotate(label=TruncDate("created_at"))
-        .values("label")
-        .annotate(total=Sum("total_amount"))
-        .order_by("label")
-    )
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+
+from django.db.models import Q, Sum
+from django.utils import timezone
+
+# These read the DailySales rollup (see rollups.daily_sales), so their cost
+# depends on the number of days in the range, not the number of bills.
+
 
+@dataclass(frozen=True)
+class SalesCounters:
+    bill_count: int
+    total_sales: Decimal
+    paid: int
+    unpaid: int
+    pay_later: int
+    high_value: int
+    today: date
+    today_sales: Decimal
 
-def get_sales_by_month(bills):
-    return (
-        bills
-        .annotate(label=TruncMonth("created_at"))
-        .values("label")
-        .annotate(total=Sum("total_amount"))
-        .order_by("label")
+    @property
+    def outstanding(self):
+        """Bills not paid yet, whether unpaid or pay-later."""
+        return self.unpaid + self.pay_later
+
+
+def get_sales_counters(days, today=None):
+    """
+    Every dashboard counter for ``days`` in one conditional aggregate query.
+    ``today_sales`` is the amount paid on ``today`` (the local date by default).
+    """
+    today = today or timezone.localdate()
+    totals = days.aggregate(
+        bill_count=Sum("bill_count", default=0),
+        total_sales=Sum("revenue", default=Decimal("0")),
+        paid=Sum("paid_count", default=0),
+        unpaid=Sum("unpaid_count", default=0),
+        pay_later=Sum("pay_later_count", default=0),
+        high_value=Sum("high_value_count", default=0),
+        today_sales=Sum("paid_amount", filter=Q(date=today), default=Decimal("0")),
     )
+    return SalesCounters(today=today, **totals)
+
+
+def get_sales_overview(days):
+    return get_sales_counters(days)
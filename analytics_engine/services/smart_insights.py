@@ -1,17 +1,14 @@
-def get_smart_insights(bills):
+def get_smart_insights(counters):
+    """``counters`` is the SalesCounters of the period being shown."""
     insights = []
 
-    total = bills.count()
-    unpaid = bills.exclude(payment_status="PAID").count()
-
-    if total == 0:
+    if counters.bill_count == 0:
         return ["No sales data available yet"]
 
-    if unpaid > total * 0.3:
+    if counters.outstanding > counters.bill_count * 0.3:
         insights.append("⚠ High number of unpaid bills")
 
-    big_bills = bills.filter(total_amount__gte=5000).count()
-    if big_bills:
-        insights.append(f"💰 {big_bills} high-value bills above ₹5,000")
+    if counters.high_value:
+        insights.append(f"💰 {counters.high_value} high-value bills above ₹5,000")
 
     return insights or ["Sales look healthy 👍"]
@@ -0,0 +1,268 @@
+import math
+
+import numpy as np
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+from analytics_engine.services.rollups import hourly_sales
+from analytics_engine.services.utils.date_ranges import business_timezone, filter_date_range
+from billing.models import Bill
+
+# Rows fetched per round trip while loading a series.
+LOAD_CHUNK_SIZE = 5000
+
+STATUS_CODES = {"PAID": 0, "UNPAID": 1, "PAY_LATER": 2}
+
+CALENDAR_FREQUENCIES = ("day", "week", "month", "quarter", "year")
+FREQUENCIES = CALENDAR_FREQUENCIES + ("hour", "weekday")
+WEEKDAY_LABELS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+HOUR_LABELS = [f"{hour:02d}:00" for hour in range(24)]
+
+DEFAULT_PERCENTILES = (25, 50, 75, 90)
+
+
+class SalesSeries:
+    """
+    The bills of one business as parallel NumPy arrays, ordered by time:
+    local timestamps (``datetime64[s]``), amounts and payment status codes.
+    Every aggregate below is a vectorized pass over these arrays, so one
+    load serves any number of charts.
+
+    A series can also hold pre-aggregated rows (see ``from_hourly``), where
+    ``counts`` says how many bills each row stands for.
+    """
+
+    def __init__(self, timestamps, amounts, statuses, counts=None):
+        self.timestamps = timestamps
+        self.amounts = amounts
+        self.statuses = statuses
+        self.counts = np.ones(len(amounts), dtype=np.int64) if counts is None else counts
+
+    @classmethod
+    def load(cls, bills, chunk_size=LOAD_CHUNK_SIZE):
+        tz = business_timezone()
+        rows = (
+            bills.order_by("created_at")
+            .values_list("created_at", "total_amount", "payment_status")
+            .iterator(chunk_size=chunk_size)
+        )
+
+        timestamps, amounts, statuses = [], [], []
+        chunk = []
+
+        def flush():
+            timestamps.append(np.array(
+                [created_at.astimezone(tz).replace(tzinfo=None) for created_at, _, _ in chunk],
+                dtype="datetime64[s]",
+            ))
+            amounts.append(np.array([amount for _, amount, _ in chunk], dtype=np.float64))
+            statuses.append(np.array([STATUS_CODES.get(status.upper(), -1) for _, _, status in chunk], dtype=np.int8))
+            chunk.clear()
+
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                flush()
+        if chunk:
+            flush()
+
+        if not timestamps:
+            return cls(
+                np.array([], dtype="datetime64[s]"),
+                np.array([], dtype=np.float64),
+                np.array([], dtype=np.int8),
+            )
+        return cls(np.concatenate(timestamps), np.concatenate(amounts), np.concatenate(statuses))
+
+    @classmethod
+    def from_hourly(cls, rows):
+        """
+        Series of HourlySales rows, one point per local hour. Rows carry no
+        payment status, so every status code is -1.
+        """
+        rows = list(rows.order_by("date", "hour").values_list("date", "hour", "revenue", "bill_count"))
+        days = np.array([row[0] for row in rows], dtype="datetime64[D]")
+        hours = np.array([row[1] for row in rows], dtype="timedelta64[h]")
+        return cls(
+            (days + hours).astype("datetime64[s]"),
+            np.array([row[2] for row in rows], dtype=np.float64),
+            np.full(len(rows), -1, dtype=np.int8),
+            np.array([row[3] for row in rows], dtype=np.int64),
+        )
+
+    def __len__(self):
+        return len(self.amounts)
+
+    def is_status(self, status):
+        return self.statuses == STATUS_CODES[status]
+
+    @property
+    def days(self):
+        return self.timestamps.astype("datetime64[D]")
+
+    @property
+    def hours(self):
+        return (self.timestamps - self.days).astype("timedelta64[h]").astype(np.int64)
+
+    @property
+    def weekdays(self):
+        # 1970-01-01 was a Thursday, so day number + 3 puts Monday at 0.
+        return (self.days.astype(np.int64) + 3) % 7
+
+    @staticmethod
+    def _periods(freq, days):
+        """Integer period number of every day in ``days``, counted from the epoch."""
+        if freq == "day":
+            return days.astype(np.int64)
+        if freq == "week":
+            # ISO weeks start on Monday; 1969-12-29 was one.
+            return (days.astype(np.int64) + 3) // 7
+        months = days.astype("datetime64[M]").astype(np.int64)
+        if freq == "month":
+            return months
+        if freq == "quarter":
+            return months // 3
+        return months // 12
+
+    @staticmethod
+    def _period_label(freq, period):
+        if freq == "day":
+            return str(np.datetime64(period, "D"))
+        if freq == "week":
+            year, week, _ = np.datetime64(period * 7 - 3, "D").astype(object).isocalendar()
+            return f"{year}-W{week:02d}"
+        if freq == "month":
+            return str(np.datetime64(period, "M"))
+        if freq == "quarter":
+            return f"{1970 + period // 4}-Q{period % 4 + 1}"
+        return str(1970 + period)
+
+    def buckets(self, freq="day", span=None):
+        """
+        ``(labels, totals, counts)`` per bucket. Calendar buckets (day, ISO
+        week, month, quarter, year) are continuous, with zeros for empty
+        periods, from the first to the last point or over the ``span``
+        ``(from_date, to_date)`` when given; hour has 24 buckets and
+        weekday 7 (Monday first).
+        """
+        if freq not in FREQUENCIES:
+            raise ValueError(f"Unknown frequency '{freq}'")
+
+        if freq == "hour":
+            index = self.hours
+            labels = HOUR_LABELS
+        elif freq == "weekday":
+            index = self.weekdays
+            labels = WEEKDAY_LABELS
+        else:
+            periods = self._periods(freq, self.days)
+            if span:
+                first, last = self._periods(freq, np.array(span, dtype="datetime64[D]")).tolist()
+            elif len(periods):
+                first, last = int(periods.min()), int(periods.max())
+            else:
+                return [], np.zeros(0), np.zeros(0, dtype=np.int64)
+            index = periods - first
+            labels = [self._period_label(freq, period) for period in range(first, last + 1)]
+
+        inside = (index >= 0) & (index < len(labels))
+        index = index[inside]
+        totals = np.bincount(index, weights=self.amounts[inside], minlength=len(labels))
+        counts = np.bincount(index, weights=self.counts[inside], minlength=len(labels)).astype(np.int64)
+        return labels, totals, counts
+
+    def heatmap(self):
+        """Sales totals and bill counts as 7 x 24 (weekday x hour) matrices."""
+        index = self.weekdays * 24 + self.hours
+        totals = np.bincount(index, weights=self.amounts, minlength=7 * 24).reshape(7, 24)
+        counts = np.bincount(index, weights=self.counts, minlength=7 * 24).reshape(7, 24)
+        return totals, counts.astype(np.int64)
+
+    def percentiles(self, q=DEFAULT_PERCENTILES):
+        """
+        Percentiles of the point amounts as ``{q: value}``; empty for no
+        points. Only bill values for a series from ``load``.
+        """
+        if not len(self):
+            return {}
+        return dict(zip(q, np.percentile(self.amounts, q).tolist()))
+
+
+def rolling_mean(values, window):
+    """
+    Trailing mean over ``window`` points. The first ``window - 1`` points
+    average over what is available, so the result has the input's length.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    sums = np.cumsum(np.concatenate(([0.0], values)))
+    positions = np.arange(1, len(values) + 1)
+    starts = np.maximum(positions - window, 0)
+    return (sums[positions] - sums[starts]) / (positions - starts)
+
+
+def load_sales_series(business, from_date=None, to_date=None):
+    bills = Bill.objects.filter(business=business, is_deleted=False)
+    return SalesSeries.load(filter_date_range(bills, from_date, to_date))
+
+
+def bill_value_percentiles(business, from_date=None, to_date=None, q=DEFAULT_PERCENTILES):
+    """
+    Percentiles of the live bill totals in ``from_date..to_date`` as
+    ``{q: value}``, interpolated like ``np.percentile``; empty for no bills.
+    The database ranks the bills and returns only the rows either side of
+    each percentile, so two queries serve any range.
+    """
+    bills = filter_date_range(
+        Bill.objects.filter(business=business, is_deleted=False),
+        from_date,
+        to_date,
+    )
+    count = bills.count()
+    if not count:
+        return {}
+
+    positions = [p / 100 * (count - 1) for p in q]
+    ranks = {rank for position in positions for rank in (math.floor(position), math.ceil(position))}
+    values = dict(
+        bills.order_by()
+        .annotate(rank=Window(RowNumber(), order_by=[F("total_amount").asc(), F("id").asc()]) - 1)
+        .filter(rank__in=ranks)
+        .values_list("rank", "total_amount")
+    )
+
+    percentiles = {}
+    for p, position in zip(q, positions):
+        low, high = float(values[math.floor(position)]), float(values[math.ceil(position)])
+        percentiles[p] = low + (high - low) * (position - math.floor(position))
+    return percentiles
+
+
+def load_hourly_series(business, from_date=None, to_date=None):
+    """Series over the business's HourlySales rollup; no bill is read."""
+    return SalesSeries.from_hourly(hourly_sales(business, from_date, to_date))
+
+
+def sales_trend(series, freq="day", window=7, span=None):
+    """
+    Chart-ready trend for ``freq`` buckets: totals, bill counts, a trailing
+    rolling mean of the totals and the running total.
+    """
+    labels, totals, counts = series.buckets(freq, span)
+    return {
+        "labels": labels,
+        "totals": totals.tolist(),
+        "counts": counts.tolist(),
+        "rolling": rolling_mean(totals, window).tolist(),
+        "cumulative": np.cumsum(totals).tolist(),
+    }
+
+
+def sales_heatmap(series):
+    """Chart-ready weekday x hour heatmap of sales totals and bill counts."""
+    totals, counts = series.heatmap()
+    return {
+        "weekdays": WEEKDAY_LABELS,
+        "hours": HOUR_LABELS,
+        "totals": totals.tolist(),
+        "counts": counts.tolist(),
+    }
@@ -0,0 +1,59 @@
+from datetime import date, datetime, time, timedelta
+
+from django.utils import timezone
+
+# Filtering with ``created_at__date__gte`` wraps the column in a date()
+# call, which stops the database from using an index on it. These helpers
+# turn local calendar dates into half-open [start, end) datetime ranges
+# that compare against the raw column instead.
+
+
+def business_timezone(business=None):
+    """
+    Timezone a business's bills are bucketed into days and hours in: the
+    configured ``TIME_ZONE``, whatever timezone is active for the request.
+    """
+    return timezone.get_default_timezone()
+
+
+def parse_date(value):
+    """``YYYY-MM-DD`` string or date to a date; None for empty or invalid input."""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        return None
+
+
+def start_of_day(day, tz=None):
+    """Aware datetime at local midnight of ``day``."""
+    return timezone.make_aware(datetime.combine(day, time.min), tz or timezone.get_current_timezone())
+
+
+def date_range(from_date=None, to_date=None, tz=None):
+    """
+    ``(start, end)`` covering the local days ``from_date`` to ``to_date``
+    inclusive, with ``end`` exclusive. Either side is None when open.
+    """
+    from_date, to_date = parse_date(from_date), parse_date(to_date)
+    start = start_of_day(from_date, tz) if from_date else None
+    end = start_of_day(to_date + timedelta(days=1), tz) if to_date else None
+    return start, end
+
+
+def day_range(day, tz=None):
+    return date_range(day, day, tz)
+
+
+def filter_date_range(queryset, from_date=None, to_date=None, field="created_at", tz=None):
+    start, end = date_range(from_date, to_date, tz)
+    if start:
+        queryset = queryset.filter(**{f"{field}__gte": start})
+    if end:
+        queryset = queryset.filter(**{f"{field}__lt": end})
+    return queryset
@@ -1,3 +1,158 @@
-from django.test import TestCase
+from datetime import date, timedelta
+from decimal import Decimal
 
-# Create your tests here.
+import numpy as np
+from django.contrib.auth.models import User
+from django.db.models import Sum
+from django.test import SimpleTestCase, TestCase
+
+from accounts.models import Business
+from analytics_engine.models import DailyItemSales, DailySales, HourlySales
+from analytics_engine.services.cache import data_version
+from analytics_engine.services.comparisons import COMPARISONS, previous_window
+from analytics_engine.services.rfm import quantile_scores, rfm_segments
+from analytics_engine.services.rollups import rebuild_rollups
+from analytics_engine.services.timeseries import bill_value_percentiles
+from billing.models import Bill
+from billing.services.bills import create_bill, delete_bills, mark_paid
+from billing.services.importer import import_rows
+
+
+def make_business(username="owner"):
+    user = User.objects.create_user(username=username, password="x")
+    return Business.objects.create(user=user, name=f"{username} shop")
+
+
+class QuantileScoreTests(SimpleTestCase):
+    def test_distinct_values_spread_over_every_score(self):
+        self.assertEqual(quantile_scores([10, 20, 30, 40, 50]).tolist(), [1, 2, 3, 4, 5])
+
+    def test_ties_score_by_mid_rank(self):
+        # 70 one-time buyers, 20 with 2 bills and 10 with 5.
+        frequency = [1] * 70 + [2] * 20 + [5] * 10
+        scores = quantile_scores(frequency)
+        self.assertEqual(set(scores[:70]), {2})
+        self.assertEqual(set(scores[70:90]), {4})
+        self.assertEqual(set(scores[90:]), {5})
+
+
+class SegmentTests(SimpleTestCase):
+    def test_one_time_buyers_reach_new_and_lost(self):
+        frequency = np.array([1] * 70 + [2] * 20 + [5] * 10)
+        # Recency spread evenly, so every recency score occurs in each group.
+        recency_days = np.tile(np.arange(10), 10)
+
+        segments = rfm_segments(quantile_scores(-recency_days), quantile_scores(frequency))
+
+        one_time = set(segments[:70])
+        self.assertFalse(one_time & {"Champions", "Loyal"})
+        self.assertIn("New", one_time)
+        self.assertIn("Lost", one_time)
+
+
+class PreviousWindowTests(SimpleTestCase):
+    def test_windows_never_overlap(self):
+        to_date = date(2026, 3, 31)
+        for days in (1, 7, 8, 30, 31, 62, 366, 400):
+            from_date = to_date - timedelta(days=days - 1)
+            for comparison in COMPARISONS:
+                with self.subTest(days=days, comparison=comparison):
+                    previous_from, previous_to = previous_window(from_date, to_date, comparison)
+                    self.assertLessEqual(previous_from, previous_to)
+                    self.assertLess(previous_to, from_date)
+
+    def test_shift_keeps_the_calendar_alignment(self):
+        from_date, to_date = date(2026, 3, 2), date(2026, 3, 31)
+        # 30 days: five whole weeks back, so weekdays still line up.
+        self.assertEqual(previous_window(from_date, to_date, "week"), (date(2026, 1, 26), date(2026, 2, 24)))
+        self.assertEqual(previous_window(from_date, to_date, "month"), (date(2026, 2, 2), date(2026, 2, 28)))
+        self.assertEqual(previous_window(date(2026, 3, 25), to_date, "week"), (date(2026, 3, 18), date(2026, 3, 24)))
+
+
+class BillValuePercentileTests(TestCase):
+    def test_matches_numpy_over_live_bills(self):
+        business = make_business()
+        amounts = [120, 80, 80, 450, 30, 999, 80, 15, 260, 75]
+        for amount in amounts:
+            create_bill(business, [("Item", 1, Decimal(amount))], payment_mode="CASH")
+        deleted = create_bill(business, [("Deleted", 1, Decimal("5000"))], payment_mode="CASH")
+        delete_bills(business, [deleted.id])
+
+        expected = np.percentile(amounts, [25, 50, 75, 90]).tolist()
+        self.assertEqual(
+            list(bill_value_percentiles(business).values()),
+            expected,
+        )
+
+    def test_empty_range(self):
+        self.assertEqual(bill_value_percentiles(make_business()), {})
+
+
+class RollupTests(TestCase):
+    """Rollups kept up to date on write must equal a rebuild from the bills."""
+
+    def setUp(self):
+        self.business = make_business()
+
+    def snapshot(self):
+        # Rows whose bills were all removed stay behind at zero; a rebuild
+        # does not create them, so they are left out of the comparison.
+        tables = {
+            DailySales: (["date"], "bill_count"),
+            HourlySales: (["date", "hour"], "bill_count"),
+            DailyItemSales: (["date", "item_name"], "quantity"),
+        }
+        snapshot = {}
+        for model, (key, count_field) in tables.items():
+            rows = model.objects.filter(business=self.business).exclude(**{count_field: 0})
+            fields = [f.attname for f in model._meta.concrete_fields if f.attname not in ("id", "business_id")]
+            snapshot[model.__name__] = sorted(tuple(row) for row in rows.values_list(*fields))
+        return snapshot
+
+    def assertMatchesRebuild(self):
+        incremental = self.snapshot()
+        rebuild_rollups(self.business)
+        self.assertEqual(incremental, self.snapshot())
+
+    def test_writes_match_rebuild(self):
+        paid = create_bill(
+            self.business,
+            [("Tea", 2, Decimal("15.00")), ("Cake", 1, Decimal("120.00"))],
+            discount=Decimal("10.00"),
+            payment_mode="UPI",
+        )
+        unpaid = create_bill(self.business, [("Tea", 1, Decimal("15.00"))], payment_status="UNPAID")
+        later = create_bill(self.business, [("Thali", 3, Decimal("2000.00"))], payment_status="PAY_LATER")
+        import_rows(self.business, [
+            {"item_name": "Tea", "quantity": "4", "price": "15", "date": "2026-01-05"},
+            {"item_name": "Coffee", "quantity": "1", "price": "40", "payment_status": "PAID", "date": "2026-01-05"},
+            {"item_name": "Coffee", "quantity": "2", "price": "40", "date": "2026-01-06"},
+        ])
+        self.assertMatchesRebuild()
+
+        mark_paid(unpaid)
+        mark_paid(unpaid)
+        self.assertMatchesRebuild()
+
+        delete_bills(self.business, [paid.id, later.id])
+        self.assertMatchesRebuild()
+
+        # Paying a deleted bill must not count it back in.
+        mark_paid(Bill.objects.get(id=later.id))
+        self.assertMatchesRebuild()
+        self.assertEqual(
+            DailySales.objects.filter(business=self.business).aggregate(total=Sum("bill_count"))["total"],
+            Bill.objects.filter(business=self.business, is_deleted=False).count(),
+        )
+
+    def test_writes_bump_the_data_version(self):
+        before = data_version(self.business)
+        bill = create_bill(self.business, [("Tea", 1, Decimal("15.00"))], payment_status="UNPAID")
+        after_create = data_version(self.business)
+        mark_paid(bill)
+        after_paid = data_version(self.business)
+        delete_bills(self.business, [bill.id])
+
+        self.assertLess(before, after_create)
+        self.assertLess(after_create, after_paid)
+        self.assertLess(after_paid, data_version(self.business))
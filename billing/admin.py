@@ -1,6 +1,10 @@
 from django.contrib import admin
-from .models import Bill, BillItem, Payment
+from .models import Bill, BillItem, Customer, ImportJob, InvoiceOutbox, Payment, ReportJob
 
 admin.site.register(Bill)
 admin.site.register(BillItem)
 admin.site.register(Payment)
+admin.site.register(ImportJob)
+admin.site.register(InvoiceOutbox)
+admin.site.register(ReportJob)
+admin.site.register(Customer)
@@ -7,6 +7,7 @@ from reportlab.lib.colors import HexColor, black, white
 from reportlab.lib.units import mm
 from pathlib import Path
 from django.conf import settings
+import hashlib
 import os
 
 NAVY = HexColor("#0A1F44")
@@ -22,11 +23,79 @@ def add_watermark(canvas, doc, bill):
     canvas.drawCentredString(0, 0, bill.payment_status.upper())
     canvas.restoreState()
 
-def generate_invoice_pdf(bill, business):
-    output_dir = Path(settings.MEDIA_ROOT) / "invoices"
+# Bump when the invoice layout changes so cached PDFs are re-rendered.
+LAYOUT_VERSION = 1
+
+
+def invoice_output_dir(business_id):
+    # One directory per business: bill numbers are only unique within a
+    # business, so cached files are named by bill id instead.
+    output_dir = Path(settings.MEDIA_ROOT) / "invoices" / str(business_id)
     output_dir.mkdir(parents=True, exist_ok=True)
+    return output_dir
+
+
+def invoice_file_stem(bill):
+    return bill.bill_number.replace("/", "_")
+
+
+def logo_version(business):
+    if business.logo and os.path.exists(business.logo.path):
+        stat = os.stat(business.logo.path)
+        return f"{business.logo.name}:{stat.st_mtime_ns}:{stat.st_size}"
+    return ""
+
+
+def invoice_content_key(bill, business):
+    """
+    Hash of everything drawn on the invoice. Any change to the items,
+    totals, payment status watermark, seller details or logo gives a new key.
+    """
+    parts = [
+        LAYOUT_VERSION,
+        bill.bill_number, bill.payment_status,
+        bill.customer_name, bill.customer_address, bill.customer_phone,
+        bill.subtotal, bill.discount, bill.total_amount,
+        business.name, business.address, business.phone, business.email,
+        logo_version(business),
+    ]
+    for item in bill.items.all():
+        parts.extend([item.item_name, item.quantity, item.price, item.total])
+
+    return hashlib.sha256("\x1f".join(map(str, parts)).encode()).hexdigest()
+
+
+def invalidate_invoice_pdf(bill):
+    for path in invoice_output_dir(bill.business_id).glob(f"{bill.id}-*.pdf"):
+        path.unlink(missing_ok=True)
+
+
+def get_invoice_pdf(bill, business):
+    """
+    Return the path of the bill's invoice PDF, rendering it only when no
+    PDF exists for the current content. Older renders of the same bill
+    are removed.
+    """
+    key = invoice_content_key(bill, business)
+    file_path = invoice_output_dir(bill.business_id) / f"{bill.id}-{key[:16]}.pdf"
+
+    if file_path.exists():
+        return str(file_path)
+
+    invalidate_invoice_pdf(bill)
+
+    # Render beside the final name and rename, so a concurrent download
+    # never sees a half-written file.
+    tmp_path = file_path.with_suffix(f".{os.getpid()}.tmp")
+    generate_invoice_pdf(bill, business, file_path=tmp_path)
+    os.replace(tmp_path, file_path)
+
+    return str(file_path)
+
 
-    file_path = output_dir / f"{bill.bill_number.replace('/', '_')}.pdf"
+def generate_invoice_pdf(bill, business, file_path=None):
+    if file_path is None:
+        file_path = invoice_output_dir(bill.business_id) / f"{invoice_file_stem(bill)}.pdf"
 
     doc = SimpleDocTemplate(
         str(file_path),
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.models import Business
+from billing.services.customers import BACKFILL_BATCH_SIZE, backfill_customers
+
+
+class Command(BaseCommand):
+    help = "Link existing bills to customers by phone/email, in batches (all businesses by default)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("business_ids", nargs="*", type=int)
+        parser.add_argument("--batch-size", type=int, default=BACKFILL_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        businesses = Business.objects.all()
+        if options["business_ids"]:
+            businesses = businesses.filter(id__in=options["business_ids"])
+            if not businesses.exists():
+                raise CommandError("No matching businesses found")
+
+        for business in businesses:
+            linked = 0
+            for count in backfill_customers(business, options["batch_size"]):
+                linked += count
+            customers = business.customers.count()
+            self.stdout.write(self.style.SUCCESS(
+                f"{business.name}: {linked} bills linked, {customers} customers"
+            ))
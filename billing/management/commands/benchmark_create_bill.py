@@ -0,0 +1,70 @@
+import random
+import threading
+import time
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from accounts.models import Business
+from billing.services.bills import create_bill
+
+
+class Command(BaseCommand):
+    help = "Benchmark create_bill throughput (bills/second) with concurrent clients"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--clients", type=int, nargs="+", default=[1, 4, 8])
+        parser.add_argument("--bills", type=int, default=200, help="Bills per client")
+
+    def handle(self, *args, **options):
+        user = User.objects.create(username=f"__benchmark_bills_{int(time.time())}")
+        business = Business.objects.create(user=user, name="Benchmark Store")
+
+        try:
+            for clients in options["clients"]:
+                self.run(business, clients, options["bills"])
+        finally:
+            # Cascades to the business, its bills and its counters.
+            user.delete()
+
+    def run(self, business, clients, bills_per_client):
+        errors = []
+
+        def client(seed):
+            rng = random.Random(seed)
+            try:
+                for _ in range(bills_per_client):
+                    items = [
+                        (f"Item {rng.randint(1, 50)}", rng.randint(1, 3), Decimal(rng.randint(10, 900)))
+                        for _ in range(rng.randint(1, 6))
+                    ]
+                    create_bill(
+                        business,
+                        items,
+                        payment_status=rng.choice(["PAID", "UNPAID"]),
+                        payment_mode="CASH",
+                        customer_name="Walk-in",
+                    )
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+
+        started = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - started
+
+        total = clients * bills_per_client
+        self.stdout.write(
+            f"{clients:>3} clients  {total:>6} bills  {elapsed:7.2f}s  "
+            f"{total / elapsed:8.0f} bills/s  ({len(errors)} errors)"
+        )
+        for e in errors[:3]:
+            self.stdout.write(self.style.WARNING(f"  {e}"))
@@ -0,0 +1,58 @@
+import random
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from accounts.models import Business
+from billing.services.importer import BATCH_SIZE, import_rows
+
+
+class Command(BaseCommand):
+    help = "Benchmark the bulk CSV import engine (rows/second). All data is rolled back."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            nargs="+",
+            default=[1_000, 10_000, 100_000],
+        )
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        rng = random.Random(42)
+
+        for count in options["rows"]:
+            rows = [
+                {
+                    "item_name": f"Item {rng.randint(1, 50)}",
+                    "quantity": str(rng.randint(1, 5)),
+                    "price": f"{rng.randint(10, 2000)}.00",
+                    "customer_name": "Walk-in",
+                    "customer_phone": "",
+                    "customer_email": "",
+                    "discount": rng.choice(["0", "0", "10"]),
+                    "payment_status": rng.choice(["PAID", "PAID", "UNPAID", "PAY_LATER"]),
+                    "payment_mode": rng.choice(["CASH", "UPI"]),
+                    "date": f"2026-01-{rng.randint(1, 28):02d}",
+                }
+                for _ in range(count)
+            ]
+
+            with transaction.atomic():
+                user = User.objects.create(username=f"__benchmark_import_{count}")
+                business = Business.objects.create(user=user, name="Benchmark Store")
+
+                started = time.perf_counter()
+                result = import_rows(business, rows, batch_size=options["batch_size"])
+                elapsed = time.perf_counter() - started
+
+                transaction.set_rollback(True)
+
+            self.stdout.write(
+                f"{count:>8} rows  {elapsed:8.2f}s  "
+                f"{result['created'] / elapsed:10.0f} rows/s  "
+                f"({len(result['failed'])} failed)"
+            )
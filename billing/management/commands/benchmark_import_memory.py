@@ -0,0 +1,73 @@
+import csv
+import random
+import tempfile
+import time
+import tracemalloc
+
+from django.core.files import File
+from django.core.management.base import BaseCommand
+
+from billing.services.importer import normalize_fieldnames, open_csv_upload, parse_row
+
+HEADER = [
+    "item_name", "quantity", "price", "customer_name", "customer_phone",
+    "customer_email", "discount", "payment_status", "payment_mode", "date",
+]
+
+
+def write_sample_csv(fh, count, rng):
+    writer = csv.writer(fh)
+    writer.writerow(HEADER)
+    for _ in range(count):
+        writer.writerow([
+            f"Item {rng.randint(1, 50)}", rng.randint(1, 5), rng.randint(10, 2000),
+            "Walk-in", "", "", 0, "PAID", "CASH", f"2026-01-{rng.randint(1, 28):02d}",
+        ])
+
+
+def parse_legacy(upload):
+    decoded_file = upload.read().decode("utf-8").splitlines()
+    reader = csv.DictReader(decoded_file)
+    reader.fieldnames = normalize_fieldnames(reader.fieldnames)
+    return sum(1 for row in reader if parse_row(row))
+
+
+def parse_streaming(upload):
+    return sum(1 for row in open_csv_upload(upload) if parse_row(row))
+
+
+class Command(BaseCommand):
+    help = "Compare peak memory of streaming vs read-all CSV upload parsing."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            nargs="+",
+            default=[10_000, 100_000, 1_000_000],
+        )
+
+    def handle(self, *args, **options):
+        rng = random.Random(42)
+
+        for count in options["rows"]:
+            with tempfile.TemporaryFile("w+b") as raw:
+                text = open(raw.fileno(), "w", newline="", closefd=False)
+                write_sample_csv(text, count, rng)
+                text.flush()
+                size_mb = raw.tell() / 1024 / 1024
+
+                for label, parse in (("read-all", parse_legacy), ("streaming", parse_streaming)):
+                    raw.seek(0)
+                    tracemalloc.start()
+                    started = time.perf_counter()
+                    parsed = parse(File(raw))
+                    elapsed = time.perf_counter() - started
+                    _, peak = tracemalloc.get_traced_memory()
+                    tracemalloc.stop()
+
+                    self.stdout.write(
+                        f"{count:>9} rows ({size_mb:6.1f} MB)  {label:<9}  "
+                        f"peak {peak / 1024 / 1024:8.2f} MB  {elapsed:6.2f}s  "
+                        f"({parsed} rows)"
+                    )
@@ -0,0 +1,123 @@
+import csv
+import random
+import tempfile
+import time
+import tracemalloc
+from io import BytesIO
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils import timezone
+from openpyxl import Workbook
+
+from accounts.models import Business
+from billing.models import Bill
+from billing.services.exports import iter_sales_csv, write_sales_workbook
+
+
+def export_legacy(bills):
+    """The previous download_sales_csv body: model instances into HttpResponse."""
+    response = HttpResponse(content_type="text/csv")
+    writer = csv.writer(response)
+    writer.writerow(["Bill Number", "Date", "Customer", "Subtotal", "Discount", "Total", "Status"])
+    for bill in bills:
+        writer.writerow([
+            bill.bill_number,
+            bill.created_at.strftime("%Y-%m-%d"),
+            bill.customer_name or "Walk-in",
+            bill.subtotal,
+            bill.discount,
+            bill.total_amount,
+            bill.payment_status,
+        ])
+    yield response.content
+
+
+def export_legacy_excel(bills):
+    """The previous download_sales_excel body: a regular in-memory workbook."""
+    wb = Workbook()
+    ws = wb.active
+    for bill in bills:
+        ws.append([
+            bill.bill_number,
+            bill.created_at.strftime("%Y-%m-%d"),
+            bill.customer_name or "Walk-in",
+            float(bill.subtotal),
+            float(bill.discount),
+            float(bill.total_amount),
+            bill.payment_status,
+        ])
+    output = BytesIO()
+    wb.save(output)
+    yield output.getvalue()
+
+
+def export_excel(bills):
+    with tempfile.TemporaryFile() as output:
+        write_sales_workbook(bills, output)
+        output.seek(0)
+        yield output.read()
+
+
+class Command(BaseCommand):
+    help = "Benchmark sales CSV and Excel exports: time to first byte and peak memory. Data is rolled back."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--bills", type=int, nargs="+", default=[10_000, 100_000])
+
+    def handle(self, *args, **options):
+        rng = random.Random(42)
+
+        for count in options["bills"]:
+            with transaction.atomic():
+                user = User.objects.create(username=f"__benchmark_export_{count}")
+                business = Business.objects.create(user=user, name="Benchmark Store")
+                now = timezone.now()
+
+                Bill.objects.bulk_create(
+                    (
+                        Bill(
+                            business=business,
+                            bill_number=f"BENCH-{i:08d}",
+                            customer_name=rng.choice(["Walk-in", "Ramesh", None]),
+                            subtotal=Decimal(rng.randint(10, 5000)),
+                            discount=Decimal("0"),
+                            total_amount=Decimal(rng.randint(10, 5000)),
+                            payment_status=rng.choice(["PAID", "UNPAID"]),
+                            created_at=now - timedelta(minutes=i),
+                        )
+                        for i in range(count)
+                    ),
+                    batch_size=2000,
+                )
+                bills = Bill.objects.filter(business=business)
+
+                exporters = (
+                    ("legacy", lambda: export_legacy(bills)),
+                    ("streaming", lambda: iter_sales_csv(bills)),
+                    ("stream+gzip", lambda: iter_sales_csv(bills, gzip=True)),
+                    ("xlsx legacy", lambda: export_legacy_excel(bills)),
+                    ("xlsx w/only", lambda: export_excel(bills)),
+                )
+                for label, export in exporters:
+                    tracemalloc.start()
+                    started = time.perf_counter()
+                    chunks = iter(export())
+                    size = len(next(chunks))
+                    first_byte = time.perf_counter() - started
+                    size += sum(len(chunk) for chunk in chunks)
+                    elapsed = time.perf_counter() - started
+                    _, peak = tracemalloc.get_traced_memory()
+                    tracemalloc.stop()
+
+                    self.stdout.write(
+                        f"{count:>8} bills  {label:<11}  TTFB {first_byte * 1000:8.1f} ms  "
+                        f"total {elapsed:6.2f}s  peak {peak / 1024 / 1024:7.2f} MB  "
+                        f"{size / 1024 / 1024:6.2f} MB sent"
+                    )
+
+                transaction.set_rollback(True)
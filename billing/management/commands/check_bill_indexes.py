@@ -0,0 +1,61 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from analytics_engine.services.utils.date_ranges import filter_date_range
+from billing.models import Bill
+from billing.services.exports import filter_bills_by_dates
+
+
+# Either composite index serves a live-bill date range; which one the
+# planner picks depends on the backend and its statistics.
+CREATED_AT_INDEXES = ("bill_live_created_idx", "bill_business_created_idx")
+
+
+def checked_queries(business_id):
+    """``(label, queryset, accepted indexes)`` for the hot date-range queries."""
+    today = timezone.localdate()
+    month_ago = today - timedelta(days=30)
+    live = Bill.objects.filter(business_id=business_id, is_deleted=False)
+    every = Bill.objects.filter(business_id=business_id)
+
+    return [
+        (
+            "bill list, date range",
+            filter_date_range(live, month_ago, today).order_by("-created_at"),
+            CREATED_AT_INDEXES,
+        ),
+        (
+            "bill list, recent",
+            live.order_by("-created_at")[:5],
+            CREATED_AT_INDEXES,
+        ),
+        (
+            "sales export, date range",
+            filter_bills_by_dates(every, month_ago, today).values_list("bill_number", "total_amount"),
+            ("bill_business_created_idx",),
+        ),
+    ]
+
+
+class Command(BaseCommand):
+    help = "EXPLAIN the date-range bill queries and fail if they do not use their index"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--business-id", type=int, default=1)
+
+    def handle(self, *args, **options):
+        failures = []
+
+        for label, queryset, indexes in checked_queries(options["business_id"]):
+            plan = queryset.explain()
+            ok = any(index in plan for index in indexes)
+            style = self.style.SUCCESS if ok else self.style.ERROR
+            self.stdout.write(style(f"{'OK  ' if ok else 'FAIL'} {label} (expects {' or '.join(indexes)})"))
+            self.stdout.write(f"     {plan}")
+            if not ok:
+                failures.append(label)
+
+        if failures:
+            raise CommandError(f"Not using the expected index: {', '.join(failures)}")
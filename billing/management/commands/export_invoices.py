@@ -0,0 +1,43 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.models import Business
+from billing.models import Bill
+from billing.services.exports import filter_bills_by_dates
+from billing.services.invoice_export import default_workers, export_invoices_zip
+
+
+def parse_date(value):
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        raise CommandError(f"Invalid date '{value}', expected YYYY-MM-DD")
+
+
+class Command(BaseCommand):
+    help = "Export invoice PDFs for a business and date range into a ZIP file"
+
+    def add_arguments(self, parser):
+        parser.add_argument("business_id", type=int)
+        parser.add_argument("output", help="Path of the ZIP file to write")
+        parser.add_argument("--from-date", type=parse_date)
+        parser.add_argument("--to-date", type=parse_date)
+        parser.add_argument("--workers", type=int, default=default_workers())
+
+    def handle(self, *args, **options):
+        try:
+            business = Business.objects.get(id=options["business_id"])
+        except Business.DoesNotExist:
+            raise CommandError(f"Business {options['business_id']} not found")
+
+        bills = filter_bills_by_dates(
+            Bill.objects.filter(business=business, is_deleted=False),
+            options["from_date"],
+            options["to_date"],
+        )
+
+        with open(options["output"], "wb") as fh:
+            count = export_invoices_zip(bills, fh, workers=options["workers"])
+
+        self.stdout.write(self.style.SUCCESS(f"Exported {count} invoices to {options['output']}"))
@@ -0,0 +1,46 @@
+from pathlib import Path
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.models import Business
+from billing.management.commands.export_invoices import parse_date
+from billing.models import Bill
+from billing.services.exports import filter_bills_by_dates
+from billing.services.parquet_export import ROW_GROUP_SIZE, write_bills_parquet, write_items_parquet
+
+
+class Command(BaseCommand):
+    help = "Export a business's bills and bill items as bills.parquet and items.parquet"
+
+    def add_arguments(self, parser):
+        parser.add_argument("business_id", type=int)
+        parser.add_argument("output_dir", help="Directory to write the Parquet files into")
+        parser.add_argument("--from-date", type=parse_date)
+        parser.add_argument("--to-date", type=parse_date)
+        parser.add_argument("--row-group-size", type=int, default=ROW_GROUP_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            business = Business.objects.get(id=options["business_id"])
+        except Business.DoesNotExist:
+            raise CommandError(f"Business {options['business_id']} not found")
+
+        bills = filter_bills_by_dates(
+            Bill.objects.filter(business=business),
+            options["from_date"],
+            options["to_date"],
+        )
+
+        output_dir = Path(options["output_dir"])
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        for name, write in (("bills", write_bills_parquet), ("items", write_items_parquet)):
+            path = output_dir / f"{name}.parquet"
+            try:
+                with open(path, "wb") as fh:
+                    count = write(bills, fh, row_group_size=options["row_group_size"])
+            except ImproperlyConfigured as e:
+                path.unlink(missing_ok=True)
+                raise CommandError(str(e))
+            self.stdout.write(self.style.SUCCESS(f"Wrote {count} rows to {path}"))
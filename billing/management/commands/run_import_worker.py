@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from billing.services.import_jobs import claim_next_job, run_import_job
+
+
+class Command(BaseCommand):
+    help = "Process queued CSV / Google Sheet import jobs"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain the queue and exit instead of polling forever",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=2.0,
+            help="Seconds to sleep when the queue is empty",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write("Import worker started")
+
+        while True:
+            job = claim_next_job()
+
+            if job is None:
+                if options["once"]:
+                    break
+                time.sleep(options["poll_interval"])
+                continue
+
+            self.stdout.write(f"Running import job #{job.id} (attempt {job.attempts})")
+            job = run_import_job(job)
+
+            style = self.style.SUCCESS if job.status == "COMPLETED" else self.style.WARNING
+            self.stdout.write(style(f"Job #{job.id}: {job.status} - {job.message}"))
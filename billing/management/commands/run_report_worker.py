@@ -0,0 +1,47 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from billing.services.invoice_export import default_workers
+from billing.services.sales_report import claim_next_report, run_report_job
+
+
+class Command(BaseCommand):
+    help = "Render queued sales PDF reports and invoice ZIPs"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain the queue and exit instead of polling forever",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=2.0,
+            help="Seconds to sleep when the queue is empty",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=default_workers(),
+            help="Processes rendering the invoices of a ZIP",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write("Report worker started")
+
+        while True:
+            job = claim_next_report()
+
+            if job is None:
+                if options["once"]:
+                    break
+                time.sleep(options["poll_interval"])
+                continue
+
+            self.stdout.write(f"Rendering {job.get_kind_display()} #{job.id} (attempt {job.attempts})")
+            job = run_report_job(job, workers=options["workers"])
+
+            style = self.style.SUCCESS if job.status == "COMPLETED" else self.style.WARNING
+            self.stdout.write(style(f"Report #{job.id}: {job.status} - {job.message}"))
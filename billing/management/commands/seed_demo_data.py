@@ -1,9 +1,12 @@
 import random
+from collections import Counter
 from datetime import timedelta
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 
+from analytics_engine.services.rollups import rebuild_rollups
 from billing.models import Bill, BillItem
+from billing.services.bill_numbers import reserve_bill_numbers
 from accounts.models import Business
 
 
@@ -48,9 +51,18 @@ class Command(BaseCommand):
         for business in businesses:
             self.stdout.write(f"🚀 Seeding data for {business.name}")
 
-            for _ in range(BILLS_PER_BUSINESS):
-                bill_date = random_date_within_months(MONTHS_BACK)
+            bill_dates = [
+                random_date_within_months(MONTHS_BACK)
+                for _ in range(BILLS_PER_BUSINESS)
+            ]
 
+            # One block of bill numbers per year instead of a count per bill
+            bill_numbers = {
+                year: iter(reserve_bill_numbers(business, count, year=year))
+                for year, count in Counter(d.year for d in bill_dates).items()
+            }
+
+            for bill_date in bill_dates:
                 num_items = random.randint(1, 5)
                 selected_items = random.sample(ITEM_CATALOG, num_items)
 
@@ -68,32 +80,19 @@ class Command(BaseCommand):
                 discount = random.choice([0, 0, 0, 50, 100, 200])
                 payment_status = random.choice(PAYMENT_STATUSES)
 
-                year = bill_date.year
-                existing_count = Bill.objects.filter(
-                    business=business,
-                    created_at__year=year
-                ).count() + 1
-
-                bill_number = f"BS/{year}/{existing_count:06d}"
-
                 bill = Bill.objects.create(
                     business=business,
-                    bill_number=bill_number,
+                    bill_number=next(bill_numbers[bill_date.year]),
                     customer_name=random.choice(
                         ["Walk-in", "Regular Customer", "Wholesale Buyer", None]
                     ),
                     subtotal=subtotal,
                     discount=discount,
+                    total_amount=max(subtotal - discount, 0),
                     payment_status=payment_status,
+                    created_at=bill_date,
                 )
 
-                # force realistic created_at
-                Bill.objects.filter(id=bill.id).update(created_at=bill_date)
-
-
-                # force realistic created_at
-                Bill.objects.filter(id=bill.id).update(created_at=bill_date)
-
                 for name, qty, price, total in items:
                     BillItem.objects.create(
                         bill=bill,
@@ -103,6 +102,8 @@ class Command(BaseCommand):
                         total=total,
                     )
 
+            rebuild_rollups(business)
+
             self.stdout.write(
                 self.style.SUCCESS(
                     f"{BILLS_PER_BUSINESS} bills created for {business.name}"
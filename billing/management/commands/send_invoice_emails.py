@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from billing.services.invoice_outbox import BATCH_SIZE, claim_due_messages, deliver
+
+
+class Command(BaseCommand):
+    help = "Render and email queued invoices from the outbox"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Send everything that is due and exit instead of polling forever",
+        )
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=5.0,
+            help="Seconds to sleep when nothing is due",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write("Invoice email worker started")
+
+        while True:
+            messages = claim_due_messages(options["batch_size"])
+
+            if not messages:
+                if options["once"]:
+                    break
+                time.sleep(options["poll_interval"])
+                continue
+
+            sent, failed = deliver(messages)
+
+            style = self.style.SUCCESS if not failed else self.style.WARNING
+            self.stdout.write(style(f"Sent {sent} invoice emails, {failed} failed"))
@@ -0,0 +1,36 @@
+# Generated by Django 6.0 on 2026-10-18 18:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0005_business_upi_id"),
+        ("billing", "0006_importjob"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="bill",
+            name="import_fingerprint",
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name="bill",
+            name="import_source",
+            field=models.CharField(blank=True, max_length=100, null=True),
+        ),
+        migrations.AddField(
+            model_name="importjob",
+            name="skipped_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddConstraint(
+            model_name="bill",
+            constraint=models.UniqueConstraint(
+                fields=("business", "import_source", "import_fingerprint"),
+                name="unique_bill_import_fingerprint",
+            ),
+        ),
+    ]
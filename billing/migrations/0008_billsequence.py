@@ -0,0 +1,42 @@
+# Generated by Django 6.0 on 2026-10-18 18:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0005_business_upi_id"),
+        ("billing", "0007_bill_import_fingerprint"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BillSequence",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("year", models.PositiveIntegerField()),
+                ("last_value", models.PositiveIntegerField(default=0)),
+                (
+                    "business",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="bill_sequences",
+                        to="accounts.business",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("business", "year")},
+            },
+        ),
+    ]
@@ -0,0 +1,99 @@
+# Generated by Django 6.0 on 2026-10-18 18:32
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def email_sent_to_status(apps, schema_editor):
+    Bill = apps.get_model("billing", "Bill")
+    Bill.objects.filter(email_sent=True).update(email_status="SENT")
+    # Emails used to be sent inline, so a required but unsent one had failed.
+    Bill.objects.filter(email_required=True, email_sent=False).update(email_status="FAILED")
+
+
+def email_status_to_sent(apps, schema_editor):
+    Bill = apps.get_model("billing", "Bill")
+    Bill.objects.filter(email_status="SENT").update(email_sent=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("billing", "0008_billsequence"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="bill",
+            name="email_status",
+            field=models.CharField(
+                choices=[
+                    ("NOT_REQUIRED", "Not Required"),
+                    ("PENDING", "Pending"),
+                    ("SENT", "Sent"),
+                    ("FAILED", "Failed"),
+                ],
+                default="NOT_REQUIRED",
+                max_length=20,
+            ),
+        ),
+        migrations.RunPython(email_sent_to_status, email_status_to_sent),
+        migrations.RemoveField(
+            model_name="bill",
+            name="email_sent",
+        ),
+        migrations.CreateModel(
+            name="InvoiceOutbox",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("PENDING", "Pending"),
+                            ("SENDING", "Sending"),
+                            ("SENT", "Sent"),
+                            ("FAILED", "Failed"),
+                        ],
+                        default="PENDING",
+                        max_length=20,
+                    ),
+                ),
+                ("attempts", models.PositiveIntegerField(default=0)),
+                (
+                    "next_attempt_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                ("locked_at", models.DateTimeField(blank=True, null=True)),
+                ("last_error", models.TextField(blank=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("sent_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "bill",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="outbox_messages",
+                        to="billing.bill",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["next_attempt_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["status", "next_attempt_at"],
+                        name="billing_inv_status_1ad5f9_idx",
+                    )
+                ],
+            },
+        ),
+    ]
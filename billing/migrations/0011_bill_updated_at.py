@@ -0,0 +1,33 @@
+# Generated by Django 6.0 on 2026-10-18 18:56
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def backfill_updated_at(apps, schema_editor):
+    Bill = apps.get_model("billing", "Bill")
+    # Best guess for existing rows: when they were deleted, else created.
+    Bill.objects.update(updated_at=Coalesce("deleted_at", "created_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0005_business_upi_id"),
+        ("billing", "0010_reportjob"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="bill",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="bill",
+            index=models.Index(
+                fields=["business", "updated_at", "id"], name="bill_change_feed_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 6.0 on 2026-10-18 19:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0005_business_upi_id"),
+        ("billing", "0011_bill_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="bill",
+            index=models.Index(
+                fields=["business", "is_deleted", "created_at"],
+                name="bill_live_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="bill",
+            index=models.Index(
+                fields=["business", "created_at"], name="bill_business_created_idx"
+            ),
+        ),
+    ]
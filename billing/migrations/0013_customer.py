@@ -0,0 +1,85 @@
+# Generated by Django 6.0 on 2026-10-18 19:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0005_business_upi_id"),
+        ("billing", "0012_bill_created_at_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Customer",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("key", models.CharField(max_length=255)),
+                ("name", models.CharField(blank=True, max_length=255, null=True)),
+                ("phone", models.CharField(blank=True, max_length=20, null=True)),
+                ("email", models.EmailField(blank=True, max_length=254, null=True)),
+                ("bill_count", models.IntegerField(default=0)),
+                (
+                    "total_spent",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                ("first_bill_at", models.DateTimeField(blank=True, null=True)),
+                ("last_bill_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "recency_score",
+                    models.PositiveSmallIntegerField(blank=True, null=True),
+                ),
+                (
+                    "frequency_score",
+                    models.PositiveSmallIntegerField(blank=True, null=True),
+                ),
+                (
+                    "monetary_score",
+                    models.PositiveSmallIntegerField(blank=True, null=True),
+                ),
+                ("segment", models.CharField(blank=True, max_length=30)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "business",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="customers",
+                        to="accounts.business",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name="bill",
+            name="customer",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="bills",
+                to="billing.customer",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="customer",
+            index=models.Index(
+                fields=["business", "segment"], name="customer_segment_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="customer",
+            constraint=models.UniqueConstraint(
+                fields=("business", "key"), name="unique_customer_key"
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-18 19:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("billing", "0013_customer"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="customer",
+            name="key",
+            field=models.CharField(max_length=300),
+        ),
+    ]
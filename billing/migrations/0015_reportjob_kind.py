@@ -0,0 +1,25 @@
+# Generated by Django 6.0 on 2026-10-18 19:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("billing", "0014_customer_key_length"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="reportjob",
+            name="kind",
+            field=models.CharField(
+                choices=[
+                    ("SALES_PDF", "Sales report (PDF)"),
+                    ("INVOICES_ZIP", "Invoices (ZIP)"),
+                ],
+                default="SALES_PDF",
+                max_length=20,
+            ),
+        ),
+    ]
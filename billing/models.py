@@ -1,8 +1,56 @@
-import uuid
 from django.db import models
 from django.utils import timezone
 from accounts.models import Business 
 
+class Customer(models.Model):
+    """
+    A customer of a business, identified by ``key``: the normalized phone
+    number, or the normalized email when there is no phone (see
+    ``billing.services.customers.customer_key``). The totals are kept in
+    step with the customer's live bills; the RFM fields are written by
+    ``segment_customers``.
+    """
+
+    business = models.ForeignKey(
+        Business,
+        on_delete=models.CASCADE,
+        related_name="customers",
+    )
+    # Room for "email:" plus the longest valid email (254 characters).
+    key = models.CharField(max_length=300)
+
+    name = models.CharField(max_length=255, blank=True, null=True)
+    phone = models.CharField(max_length=20, blank=True, null=True)
+    email = models.EmailField(blank=True, null=True)
+
+    bill_count = models.IntegerField(default=0)
+    total_spent = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    first_bill_at = models.DateTimeField(null=True, blank=True)
+    last_bill_at = models.DateTimeField(null=True, blank=True)
+
+    # Scores 1 (worst) to 5 (best) within the business.
+    recency_score = models.PositiveSmallIntegerField(null=True, blank=True)
+    frequency_score = models.PositiveSmallIntegerField(null=True, blank=True)
+    monetary_score = models.PositiveSmallIntegerField(null=True, blank=True)
+    segment = models.CharField(max_length=30, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["business", "key"],
+                name="unique_customer_key",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["business", "segment"], name="customer_segment_idx"),
+        ]
+
+    def __str__(self):
+        return self.name or self.phone or self.email or self.key
+
+
 class Bill(models.Model):
     PAYMENT_STATUS_CHOICES = [
         ("PAID", "Paid"),
@@ -22,6 +70,14 @@ class Bill(models.Model):
     customer_phone = models.CharField(max_length=20, blank=True, null=True)
     customer_email = models.EmailField(blank=True, null=True)
     customer_address = models.TextField(blank=True, null=True)
+    # Set from the phone/email above; None for walk-in bills without either.
+    customer = models.ForeignKey(
+        Customer,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="bills",
+    )
 
     subtotal = models.DecimalField(max_digits=10, decimal_places=2)
     discount = models.DecimalField(max_digits=10, decimal_places=2, default=0)
@@ -33,25 +89,65 @@ class Bill(models.Model):
         default="PAID",
     )
 
+    EMAIL_STATUS_CHOICES = [
+        ("NOT_REQUIRED", "Not Required"),
+        ("PENDING", "Pending"),
+        ("SENT", "Sent"),
+        ("FAILED", "Failed"),
+    ]
+
     email_required = models.BooleanField(default=False)
-    email_sent = models.BooleanField(default=False)
+    email_status = models.CharField(
+        max_length=20,
+        choices=EMAIL_STATUS_CHOICES,
+        default="NOT_REQUIRED",
+    )
 
     is_deleted = models.BooleanField(default=False)
     deleted_at = models.DateTimeField(null=True, blank=True)
 
     created_at = models.DateTimeField(auto_now_add=False, default=timezone.now)
+    # Bumped on every write; the change feed pages through bills by it.
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # Set only for imported bills: where the row came from and a hash of its
+    # content, so re-importing the same file or sheet skips known rows.
+    import_source = models.CharField(max_length=100, blank=True, null=True)
+    import_fingerprint = models.CharField(max_length=64, blank=True, null=True)
 
     class Meta:
         unique_together = ("business", "bill_number")
         ordering = ["-created_at"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["business", "import_source", "import_fingerprint"],
+                name="unique_bill_import_fingerprint",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["business", "updated_at", "id"],
+                name="bill_change_feed_idx",
+            ),
+            # Date ranges over live bills (bill list, analytics) ...
+            models.Index(
+                fields=["business", "is_deleted", "created_at"],
+                name="bill_live_created_idx",
+            ),
+            # ... and over all bills (sales exports, weekly insights).
+            models.Index(
+                fields=["business", "created_at"],
+                name="bill_business_created_idx",
+            ),
+        ]
 
 
 
     def save(self, *args, **kwargs):
         if not self.bill_number:
-            year = timezone.now().year
-            business_name = self.business.name.replace(" ", "").upper()
-            self.bill_number = f"BS_{year}_{business_name}-{uuid.uuid4().hex[:6].upper()}"
+            from billing.services.bill_numbers import reserve_bill_numbers
+
+            self.bill_number = reserve_bill_numbers(self.business, 1)[0]
         super().save(*args, **kwargs)
 
 
@@ -69,6 +165,28 @@ class Bill(models.Model):
 
 
 
+class BillSequence(models.Model):
+    """
+    Last bill number handed out per business and year. Numbers are taken in
+    blocks by billing.services.bill_numbers inside the caller's transaction,
+    so the row is locked until it commits and a rolled-back block is reused.
+    """
+
+    business = models.ForeignKey(
+        Business,
+        on_delete=models.CASCADE,
+        related_name="bill_sequences",
+    )
+    year = models.PositiveIntegerField()
+    last_value = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ("business", "year")
+
+    def __str__(self):
+        return f"{self.business} {self.year}: {self.last_value}"
+
+
 class BillItem(models.Model):
     bill = models.ForeignKey(
         Bill,
@@ -112,3 +230,171 @@ class Payment(models.Model):
 
     def __str__(self):
         return f"{self.bill.bill_number} - {self.method}"
+
+
+class ImportJob(models.Model):
+    SOURCE_CHOICES = [
+        ("CSV", "CSV File"),
+        ("GOOGLE_SHEET", "Google Sheet"),
+    ]
+
+    STATUS_CHOICES = [
+        ("PENDING", "Pending"),
+        ("RUNNING", "Running"),
+        ("COMPLETED", "Completed"),
+        ("FAILED", "Failed"),
+    ]
+
+    business = models.ForeignKey(
+        Business,
+        on_delete=models.CASCADE,
+        related_name="import_jobs",
+    )
+
+    source = models.CharField(max_length=20, choices=SOURCE_CHOICES)
+    file = models.FileField(upload_to="imports/", blank=True, null=True)
+    sheet_url = models.URLField(max_length=500, blank=True, null=True)
+
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default="PENDING",
+    )
+
+    total_rows = models.PositiveIntegerField(null=True, blank=True)
+    # Last data row whose batch is committed; a resumed job skips up to here.
+    rows_processed = models.PositiveIntegerField(default=0)
+    bills_created = models.PositiveIntegerField(default=0)
+    skipped_count = models.PositiveIntegerField(default=0)
+    failed_count = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True)
+    message = models.TextField(blank=True)
+
+    attempts = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["status", "created_at"]),
+        ]
+
+    @property
+    def is_active(self):
+        return self.status in ("PENDING", "RUNNING")
+
+    @property
+    def progress(self):
+        if self.status == "COMPLETED":
+            return 100
+        if not self.total_rows:
+            return 0
+        return min(int(self.rows_processed * 100 / self.total_rows), 99)
+
+    def __str__(self):
+        return f"{self.get_source_display()} import #{self.id} ({self.status})"
+
+
+class InvoiceOutbox(models.Model):
+    """
+    Invoice emails waiting to be rendered and sent. Rows are written in the
+    same transaction as the bill and delivered by ``send_invoice_emails``.
+    """
+
+    STATUS_CHOICES = [
+        ("PENDING", "Pending"),
+        ("SENDING", "Sending"),
+        ("SENT", "Sent"),
+        ("FAILED", "Failed"),
+    ]
+
+    bill = models.ForeignKey(
+        Bill,
+        on_delete=models.CASCADE,
+        related_name="outbox_messages",
+    )
+
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default="PENDING",
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["next_attempt_at"]
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"]),
+        ]
+
+    def __str__(self):
+        return f"Invoice email for {self.bill.bill_number} ({self.status})"
+
+
+class ReportJob(models.Model):
+    """
+    A sales PDF report or invoice ZIP too large to build inside a request.
+    Rendered by ``run_report_worker`` and downloaded from the analytics page.
+    """
+
+    KIND_CHOICES = [
+        ("SALES_PDF", "Sales report (PDF)"),
+        ("INVOICES_ZIP", "Invoices (ZIP)"),
+    ]
+
+    STATUS_CHOICES = [
+        ("PENDING", "Pending"),
+        ("RUNNING", "Running"),
+        ("COMPLETED", "Completed"),
+        ("FAILED", "Failed"),
+    ]
+
+    business = models.ForeignKey(
+        Business,
+        on_delete=models.CASCADE,
+        related_name="report_jobs",
+    )
+    kind = models.CharField(
+        max_length=20,
+        choices=KIND_CHOICES,
+        default="SALES_PDF",
+    )
+
+    from_date = models.DateField(null=True, blank=True)
+    to_date = models.DateField(null=True, blank=True)
+
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default="PENDING",
+    )
+    file = models.FileField(upload_to="reports/", blank=True, null=True)
+    bill_count = models.PositiveIntegerField(null=True, blank=True)
+    message = models.TextField(blank=True)
+
+    attempts = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["status", "created_at"]),
+        ]
+
+    @property
+    def is_active(self):
+        return self.status in ("PENDING", "RUNNING")
+
+    def __str__(self):
+        return f"Sales report #{self.id} ({self.status})"
@@ -0,0 +1,69 @@
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from billing.models import Bill, BillSequence
+
+
+def bill_number_prefix(business, year):
+    business_name = business.name.replace(" ", "").upper()
+    return f"BS_{year}_{business_name}-"
+
+
+def _highest_issued(business, year):
+    """
+    Highest sequence already used for this business/year, so a counter
+    created for existing data continues after it instead of colliding.
+    Runs once per business and year.
+    """
+    prefix = bill_number_prefix(business, year)
+    highest = 0
+    numbers = Bill.objects.filter(
+        business=business,
+        bill_number__startswith=prefix,
+    ).values_list("bill_number", flat=True)
+
+    for number in numbers.iterator():
+        suffix = number[len(prefix):]
+        if suffix.isdigit():
+            highest = max(highest, int(suffix))
+    return highest
+
+
+def reserve_bill_numbers(business, count, year=None):
+    """
+    Atomically reserve ``count`` consecutive bill numbers for a business.
+
+    The block is taken with a single UPDATE ... SET last_value = last_value + count,
+    which the database serializes per counter row, so concurrent callers
+    always get disjoint blocks. The UPDATE joins the caller's transaction:
+    the counter row stays locked until the caller commits. If the caller
+    rolls back, the reservation rolls back with it and the same numbers
+    are handed out again, so committed bills never share a number and
+    leave no gaps. ``year`` defaults to the local year.
+    """
+    if count <= 0:
+        return []
+
+    year = year or timezone.localdate().year
+
+    with transaction.atomic():
+        counter = BillSequence.objects.filter(business=business, year=year)
+        updated = counter.update(last_value=F("last_value") + count)
+
+        if not updated:
+            try:
+                with transaction.atomic():
+                    BillSequence.objects.create(
+                        business=business,
+                        year=year,
+                        last_value=_highest_issued(business, year) + count,
+                    )
+            except IntegrityError:
+                # Another request created the counter first.
+                counter.update(last_value=F("last_value") + count)
+
+        last_value = counter.values_list("last_value", flat=True).get()
+
+    prefix = bill_number_prefix(business, year)
+    return [f"{prefix}{n:06d}" for n in range(last_value - count + 1, last_value + 1)]
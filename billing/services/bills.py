@@ -0,0 +1,145 @@
+from copy import copy
+from decimal import Decimal
+
+from django.db import transaction
+from django.utils import timezone
+
+from analytics_engine.services.rollups import add_bills, change_bills, remove_bills
+from billing.models import Bill, BillItem, InvoiceOutbox, Payment
+from billing.services.customers import link_customers, refresh_bill_customers
+
+# Bills at or above this amount must be emailed to the customer.
+EMAIL_REQUIRED_AMOUNT = Decimal("5000")
+
+
+def bill_totals(items, discount):
+    """
+    ``items`` is a list of ``(item_name, quantity, price)``.
+    Returns ``(subtotal, total_amount)``.
+    """
+    subtotal = sum((q * p for _, q, p in items), Decimal("0.00"))
+    return subtotal, max(subtotal - discount, Decimal("0.00"))
+
+
+def create_bill(
+    business,
+    items,
+    discount=Decimal("0.00"),
+    payment_status="PAID",
+    payment_mode=None,
+    customer_name=None,
+    customer_phone=None,
+    customer_email=None,
+    customer_address=None,
+):
+    """
+    Create a bill with its items and payment in one transaction.
+
+    Items are written with a single bulk_create and attached to the
+    returned bill, so rendering it does not query them again. Bills that
+    need an emailed invoice get an outbox row in the same transaction.
+    Nothing is written if any part fails.
+    """
+    subtotal, total_amount = bill_totals(items, discount)
+    email_required = total_amount >= EMAIL_REQUIRED_AMOUNT
+
+    with transaction.atomic():
+        bill = Bill.objects.create(
+            business=business,
+            customer_name=customer_name,
+            customer_phone=customer_phone,
+            customer_email=customer_email,
+            customer_address=customer_address,
+            subtotal=subtotal,
+            discount=discount,
+            total_amount=total_amount,
+            payment_status=payment_status,
+            email_required=email_required,
+            email_status="PENDING" if email_required else "NOT_REQUIRED",
+        )
+
+        bill_items = BillItem.objects.bulk_create([
+            BillItem(
+                bill=bill,
+                item_name=n,
+                quantity=q,
+                price=p,
+                total=q * p,
+            )
+            for n, q, p in items
+        ])
+
+        if payment_status == "PAID":
+            Payment.objects.create(
+                bill=bill,
+                method=payment_mode,
+                reference_id=None
+            )
+
+        if email_required:
+            InvoiceOutbox.objects.create(bill=bill)
+
+        add_bills([bill], bill_items)
+        link_customers([bill])
+
+    # Fill the prefetch cache the same way prefetch_related() does.
+    items_qs = bill.items.all()
+    items_qs._result_cache = bill_items
+    items_qs._prefetch_done = True
+    bill._prefetched_objects_cache = {"items": items_qs}
+
+    return bill
+
+
+def mark_paid(bill):
+    """
+    Mark ``bill`` paid. A no-op for bills that are already paid or deleted,
+    checked against the locked row rather than the possibly stale instance.
+    """
+    if bill.payment_status == "PAID" or bill.is_deleted:
+        return bill
+
+    with transaction.atomic():
+        current = (
+            Bill.objects
+            .select_for_update()
+            .filter(pk=bill.pk, is_deleted=False)
+            .exclude(payment_status="PAID")
+            .first()
+        )
+        if current is None:
+            return bill
+
+        before = copy(current)
+        current.payment_status = "PAID"
+        current.save()
+        change_bills([before], [current])
+
+    bill.payment_status = current.payment_status
+    bill.updated_at = current.updated_at
+    return bill
+
+
+def delete_bills(business, bill_ids):
+    """
+    Soft-delete the given bills of ``business``. Returns how many were
+    deleted; bills already deleted are left alone.
+    """
+    with transaction.atomic():
+        bills = list(
+            Bill.objects
+            .filter(id__in=bill_ids, business=business, is_deleted=False)
+            .only("id", "business_id", "created_at", "total_amount", "discount", "payment_status", "is_deleted")
+        )
+        ids = [bill.id for bill in bills]
+        remove_bills(bills)
+
+        now = timezone.now()
+        Bill.objects.filter(id__in=ids).update(
+            is_deleted=True,
+            deleted_at=now,
+            updated_at=now,
+        )
+        refresh_bill_customers(ids)
+
+    return len(ids)
@@ -0,0 +1,117 @@
+import base64
+import json
+from datetime import datetime, timedelta
+
+from django.db.models import Q
+from django.utils import timezone
+
+from billing.models import Bill, BillItem
+
+PAGE_SIZE = 500
+MAX_PAGE_SIZE = 5000
+
+# Rows touched in the last few seconds are held back until the next poll,
+# so a slow transaction that commits an older ``updated_at`` is not skipped.
+SAFETY_LAG = timedelta(seconds=5)
+
+CHANGE_FIELDS = (
+    "id", "bill_number", "created_at", "updated_at",
+    "customer_name", "customer_phone", "customer_email",
+    "subtotal", "discount", "total_amount",
+    "payment_status", "payment__method", "payment__paid_at",
+    "is_deleted", "deleted_at",
+)
+
+
+def encode_cursor(updated_at, bill_id):
+    raw = json.dumps([updated_at.isoformat(), bill_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Return ``(updated_at, bill_id)``; raises ValueError for a bad cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        updated_at, bill_id = json.loads(raw)
+        return datetime.fromisoformat(updated_at), int(bill_id)
+    except (TypeError, ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def _isoformat(value):
+    return value.isoformat() if value else None
+
+
+def get_changes(business, cursor=None, limit=PAGE_SIZE):
+    """
+    Bills of ``business`` created, edited, paid or soft-deleted after
+    ``cursor``, oldest change first, with their items.
+
+    Pages are read by (updated_at, id) from ``bill_change_feed_idx``, so the
+    cost depends on the number of changes, not on the size of the history.
+    Pass ``next_cursor`` back to continue; it is returned even when there
+    are no changes.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    bills = Bill.objects.filter(
+        business=business,
+        updated_at__lte=timezone.now() - SAFETY_LAG,
+    )
+    if cursor:
+        updated_at, bill_id = decode_cursor(cursor)
+        bills = bills.filter(
+            Q(updated_at__gt=updated_at)
+            | Q(updated_at=updated_at, id__gt=bill_id)
+        )
+
+    rows = list(bills.order_by("updated_at", "id").values(*CHANGE_FIELDS)[:limit + 1])
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    items = {}
+    for bill_id, item_name, quantity, price, total in (
+        BillItem.objects
+        .filter(bill_id__in=[row["id"] for row in rows])
+        .order_by("id")
+        .values_list("bill_id", "item_name", "quantity", "price", "total")
+    ):
+        items.setdefault(bill_id, []).append({
+            "item_name": item_name,
+            "quantity": quantity,
+            "price": str(price),
+            "total": str(total),
+        })
+
+    changes = [
+        {
+            "op": "delete" if row["is_deleted"] else "upsert",
+            "id": row["id"],
+            "bill_number": row["bill_number"],
+            "created_at": _isoformat(row["created_at"]),
+            "updated_at": _isoformat(row["updated_at"]),
+            "customer_name": row["customer_name"],
+            "customer_phone": row["customer_phone"],
+            "customer_email": row["customer_email"],
+            # Strings keep the exact decimal value through JSON.
+            "subtotal": str(row["subtotal"]),
+            "discount": str(row["discount"]),
+            "total_amount": str(row["total_amount"]),
+            "payment_status": row["payment_status"],
+            "payment_method": row["payment__method"],
+            "paid_at": _isoformat(row["payment__paid_at"]),
+            "deleted_at": _isoformat(row["deleted_at"]),
+            "items": items.get(row["id"], []),
+        }
+        for row in rows
+    ]
+
+    next_cursor = (
+        encode_cursor(rows[-1]["updated_at"], rows[-1]["id"]) if rows else cursor
+    )
+
+    return {
+        "changes": changes,
+        "next_cursor": next_cursor,
+        "has_more": has_more,
+    }
@@ -0,0 +1,163 @@
+import re
+
+from django.db import transaction
+from django.db.models import Count, Max, Min, Sum
+
+from analytics_engine.services.rollups import bump_data_version
+from billing.models import Bill, Customer
+
+# Phone numbers are compared on their last ten digits, so "+91 98765 43210",
+# "098765 43210" and "9876543210" are one customer. Fewer digits than this
+# is not treated as a phone number at all.
+PHONE_DIGITS = 10
+MIN_PHONE_DIGITS = 6
+
+BACKFILL_BATCH_SIZE = 2000
+
+
+def normalize_phone(phone):
+    digits = re.sub(r"\D", "", phone or "")
+    if len(digits) < MIN_PHONE_DIGITS:
+        return None
+    return digits[-PHONE_DIGITS:]
+
+
+def normalize_email(email):
+    email = (email or "").strip().lower()
+    return email if "@" in email else None
+
+
+def customer_key(phone=None, email=None):
+    """
+    Key identifying a customer within a business: the normalized phone, or
+    the normalized email when there is no usable phone. None for neither.
+    """
+    phone = normalize_phone(phone)
+    if phone:
+        return f"phone:{phone}"
+    email = normalize_email(email)
+    if email:
+        return f"email:{email}"
+    return None
+
+
+def link_customers(bills):
+    """
+    Point each of ``bills`` at its Customer, creating missing customers,
+    and refresh the totals of every customer touched. Call inside the
+    transaction that wrote the bills.
+    """
+    keyed = {}
+    for bill in bills:
+        key = customer_key(bill.customer_phone, bill.customer_email)
+        if key:
+            keyed.setdefault(key, []).append(bill)
+    if not keyed:
+        return 0
+
+    business_id = bills[0].business_id
+    Customer.objects.bulk_create(
+        [
+            Customer(
+                business_id=business_id,
+                key=key,
+                name=group[0].customer_name,
+                phone=group[0].customer_phone,
+                email=group[0].customer_email,
+            )
+            for key, group in keyed.items()
+        ],
+        ignore_conflicts=True,
+    )
+    customer_ids = dict(
+        Customer.objects
+        .filter(business_id=business_id, key__in=keyed)
+        .values_list("key", "id")
+    )
+
+    linked = []
+    for key, group in keyed.items():
+        for bill in group:
+            bill.customer_id = customer_ids[key]
+            linked.append(bill)
+    Bill.objects.bulk_update(linked, ["customer"], batch_size=1000)
+
+    refresh_customers(customer_ids.values())
+    return len(linked)
+
+
+def refresh_customers(customer_ids):
+    """
+    Recompute the totals of the given customers from their live bills.
+    The rows are locked first, so concurrent writers refresh one at a time
+    and the last one sees every committed bill.
+    """
+    with transaction.atomic():
+        customers = list(
+            Customer.objects
+            .select_for_update()
+            .filter(id__in=list(customer_ids))
+            .order_by("id")
+        )
+        totals = {
+            row["customer_id"]: row
+            for row in (
+                Bill.objects
+                .filter(customer__in=customers, is_deleted=False)
+                .values("customer_id")
+                .annotate(
+                    bill_count=Count("id"),
+                    total_spent=Sum("total_amount"),
+                    first_bill_at=Min("created_at"),
+                    last_bill_at=Max("created_at"),
+                )
+            )
+        }
+
+        fields = ["bill_count", "total_spent", "first_bill_at", "last_bill_at"]
+        for customer in customers:
+            row = totals.get(customer.id, {"bill_count": 0, "total_spent": 0})
+            for field in fields:
+                setattr(customer, field, row.get(field))
+        Customer.objects.bulk_update(customers, fields, batch_size=1000)
+
+    return len(customers)
+
+
+def refresh_bill_customers(bill_ids):
+    """Refresh the customers of the given bills, e.g. after deleting them."""
+    customer_ids = set(
+        Bill.objects
+        .filter(id__in=bill_ids, customer__isnull=False)
+        .values_list("customer_id", flat=True)
+    )
+    return refresh_customers(customer_ids) if customer_ids else 0
+
+
+def backfill_customers(business, batch_size=BACKFILL_BATCH_SIZE):
+    """
+    Link the existing bills of ``business`` that have no customer yet, one
+    batch of ids per transaction. Yields the number linked per batch, and
+    bumps the business's data version at the end if any bill was linked,
+    so cached customer analytics are recomputed.
+    """
+    last_id = 0
+    linked = 0
+    while True:
+        batch = list(
+            Bill.objects
+            .filter(business=business, customer__isnull=True, id__gt=last_id)
+            .order_by("id")
+            .only("id", "business_id", "customer_name", "customer_phone", "customer_email")[:batch_size]
+        )
+        if not batch:
+            break
+        last_id = batch[-1].id
+
+        with transaction.atomic():
+            count = link_customers(batch)
+        linked += count
+        yield count
+
+    if linked:
+        bump_data_version(business.id)
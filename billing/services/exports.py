@@ -0,0 +1,127 @@
+import csv
+
+from django.utils.text import compress_sequence
+from openpyxl import Workbook
+
+from analytics_engine.services.utils.date_ranges import filter_date_range
+from billing.models import BillItem
+
+# Rows fetched from the database per round trip when streaming exports.
+EXPORT_CHUNK_SIZE = 2000
+
+SALES_HEADER = [
+    "Bill Number", "Date", "Customer",
+    "Subtotal", "Discount", "Total", "Status",
+]
+
+SALES_COLUMNS = (
+    "bill_number", "created_at", "customer_name",
+    "subtotal", "discount", "total_amount", "payment_status",
+)
+
+
+ITEMS_HEADER = ["Bill Number", "Date", "Item", "Quantity", "Price", "Total"]
+
+ITEMS_COLUMNS = (
+    "bill__bill_number", "bill__created_at", "item_name",
+    "quantity", "price", "total",
+)
+
+
+def filter_bills_by_dates(queryset, from_date=None, to_date=None):
+    """Inclusive ``YYYY-MM-DD`` local date filter shared by the sales exports."""
+    return filter_date_range(queryset, from_date, to_date)
+
+
+class Echo:
+    """File-like object whose write() just returns the value, for csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def iter_sales_rows(bills):
+    """
+    Yield one tuple per bill in the sales export layout, reading plain
+    ``values_list`` rows in chunks instead of model instances.
+    """
+    rows = bills.values_list(*SALES_COLUMNS).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+    for number, created_at, customer, subtotal, discount, total, status in rows:
+        yield (
+            number,
+            created_at.strftime("%Y-%m-%d"),
+            customer or "Walk-in",
+            subtotal,
+            discount,
+            total,
+            status,
+        )
+
+
+def iter_sales_csv(bills, gzip=False):
+    """
+    Yield the sales CSV as encoded chunks of lines, optionally gzipped,
+    for a StreamingHttpResponse.
+    """
+    writer = csv.writer(Echo())
+
+    def lines():
+        yield writer.writerow(SALES_HEADER)
+        buffer = []
+        for row in iter_sales_rows(bills):
+            buffer.append(writer.writerow(row))
+            if len(buffer) >= 500:
+                yield "".join(buffer)
+                buffer.clear()
+        if buffer:
+            yield "".join(buffer)
+
+    chunks = (line.encode("utf-8") for line in lines())
+    return compress_sequence(chunks) if gzip else chunks
+
+
+def iter_item_rows(bills):
+    """
+    Yield one tuple per bill item for ``bills`` from a single joined query,
+    instead of loading items bill by bill.
+    """
+    rows = (
+        BillItem.objects
+        .filter(bill__in=bills.order_by().values("id"))
+        .order_by("bill__created_at", "bill_id", "id")
+        .values_list(*ITEMS_COLUMNS)
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+
+    for number, created_at, item_name, quantity, price, total in rows:
+        yield (
+            number,
+            created_at.strftime("%Y-%m-%d"),
+            item_name,
+            quantity,
+            float(price),
+            float(total),
+        )
+
+
+def write_sales_workbook(bills, fileobj, include_items=False):
+    """
+    Write the sales report as .xlsx to ``fileobj`` using openpyxl's
+    write-only mode, which streams rows to disk instead of keeping a cell
+    object per value.
+    """
+    wb = Workbook(write_only=True)
+
+    ws = wb.create_sheet("Sales Report")
+    ws.append(SALES_HEADER)
+    for number, date, customer, subtotal, discount, total, status in iter_sales_rows(bills):
+        ws.append([number, date, customer, float(subtotal), float(discount), float(total), status])
+
+    if include_items:
+        items_ws = wb.create_sheet("Items")
+        items_ws.append(ITEMS_HEADER)
+        for row in iter_item_rows(bills):
+            items_ws.append(row)
+
+    wb.save(fileobj)
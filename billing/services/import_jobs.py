@@ -0,0 +1,170 @@
+import logging
+import tempfile
+from datetime import timedelta
+
+import requests
+from django.core.files import File
+from django.db.models import Q
+from django.utils import timezone
+
+from billing.models import ImportJob
+from billing.services.importer import MAX_REPORTED_FAILURES, import_rows, open_csv_upload
+
+logger = logging.getLogger(__name__)
+
+# A RUNNING job whose heartbeat is older than this is treated as crashed.
+STALE_AFTER = timedelta(minutes=5)
+MAX_ATTEMPTS = 3
+
+
+def extract_sheet_csv_url(sheet_url: str) -> str:
+    if "export?format=csv" in sheet_url:
+        return sheet_url
+    try:
+        sheet_id = sheet_url.split("/d/")[1].split("/")[0]
+        return f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv"
+    except Exception:
+        return sheet_url
+
+
+def import_source_for(job):
+    """
+    Fingerprint namespace for a job: all CSV uploads of a business share
+    one, each Google Sheet gets its own so re-syncing it skips known rows.
+    """
+    if job.source == "GOOGLE_SHEET":
+        return f"sheet:{extract_sheet_csv_url(job.sheet_url)}"[:100]
+    return "csv"
+
+
+def enqueue_csv_import(business, uploaded_file):
+    job = ImportJob(business=business, source="CSV")
+    job.file.save(uploaded_file.name, uploaded_file, save=False)
+    job.save()
+    return job
+
+
+def enqueue_sheet_import(business, sheet_url):
+    return ImportJob.objects.create(
+        business=business,
+        source="GOOGLE_SHEET",
+        sheet_url=sheet_url,
+    )
+
+
+def claim_next_job(stale_after=STALE_AFTER):
+    """
+    Atomically take the oldest pending job, or a running job whose worker
+    stopped sending heartbeats. Returns None when the queue is empty.
+    """
+    now = timezone.now()
+    claimable = ImportJob.objects.filter(
+        Q(status="PENDING")
+        | Q(status="RUNNING", heartbeat_at__lt=now - stale_after)
+    ).order_by("created_at")
+
+    for job in claimable[:10]:
+        # Compare-and-set on the heartbeat so two workers never claim the same job.
+        claimed = ImportJob.objects.filter(
+            id=job.id,
+            status=job.status,
+            heartbeat_at=job.heartbeat_at,
+        ).update(
+            status="RUNNING",
+            attempts=job.attempts + 1,
+            started_at=job.started_at or now,
+            heartbeat_at=now,
+        )
+        if claimed:
+            job.refresh_from_db()
+            return job
+
+    return None
+
+
+def _download_sheet(job):
+    """
+    Snapshot the sheet into the job's file once, so a resumed job reads the
+    same rows instead of re-fetching a sheet that may have changed.
+    """
+    with requests.get(extract_sheet_csv_url(job.sheet_url), stream=True, timeout=60) as response:
+        response.raise_for_status()
+        with tempfile.TemporaryFile() as tmp:
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                tmp.write(chunk)
+            tmp.seek(0)
+            job.file.save(f"sheet_{job.id}.csv", File(tmp), save=False)
+    job.save(update_fields=["file"])
+
+
+def _count_rows(job):
+    with job.file.open("rb"):
+        return sum(1 for _ in open_csv_upload(job.file))
+
+
+def run_import_job(job):
+    """
+    Run a claimed job to completion, resuming after its last committed batch.
+    """
+    # Resumed runs add to what earlier attempts already committed.
+    base_created = job.bills_created
+    base_skipped = job.skipped_count
+    base_failed = job.failed_count
+    base_errors = list(job.errors)
+
+    def on_batch(result, last_row):
+        job.rows_processed = last_row
+        job.bills_created = base_created + result["created"]
+        job.skipped_count = base_skipped + result["skipped"]
+        job.failed_count = base_failed + result["failed_count"]
+        job.errors = (base_errors + result["failed"])[:MAX_REPORTED_FAILURES]
+        job.heartbeat_at = timezone.now()
+        job.save(update_fields=[
+            "rows_processed", "bills_created", "skipped_count",
+            "failed_count", "errors", "heartbeat_at",
+        ])
+
+    try:
+        if not job.file:
+            _download_sheet(job)
+
+        if job.total_rows is None:
+            job.total_rows = _count_rows(job)
+            job.save(update_fields=["total_rows"])
+
+        default_customer = (
+            "Imported (Google Sheet)" if job.source == "GOOGLE_SHEET" else "Imported"
+        )
+
+        with job.file.open("rb"):
+            import_rows(
+                job.business,
+                open_csv_upload(job.file),
+                default_customer=default_customer,
+                source=import_source_for(job),
+                start_row=job.rows_processed,
+                on_batch=on_batch,
+            )
+
+    except Exception as e:
+        logger.exception(f"Import job {job.id} failed")
+        job.refresh_from_db()
+        job.message = str(e)
+        if job.attempts >= MAX_ATTEMPTS:
+            job.status = "FAILED"
+            job.finished_at = timezone.now()
+        else:
+            job.status = "PENDING"
+        job.save(update_fields=["status", "message", "finished_at"])
+        return job
+
+    job.status = "COMPLETED"
+    job.finished_at = timezone.now()
+    job.message = f"Imported {job.bills_created} rows"
+    if job.skipped_count:
+        job.message += f", {job.skipped_count} already imported rows skipped"
+    if job.failed_count:
+        job.message += f", {job.failed_count} rows failed"
+    job.save(update_fields=["status", "finished_at", "message"])
+
+    return job
@@ -0,0 +1,316 @@
+import codecs
+import csv
+import hashlib
+import logging
+from collections import Counter
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from analytics_engine.services.rollups import add_bills
+from billing.models import Bill, BillItem, Payment
+from billing.services.bill_numbers import reserve_bill_numbers
+from billing.services.customers import link_customers
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+
+PAYMENT_STATUSES = {code for code, _ in Bill.PAYMENT_STATUS_CHOICES}
+PAYMENT_MODES = {code for code, _ in Payment.PAYMENT_METHOD_CHOICES}
+
+# DecimalField(max_digits=10, decimal_places=2)
+MAX_AMOUNT = Decimal("99999999.99")
+CENTS = Decimal("0.01")
+
+# Guard against a "line" that never ends (binary upload, missing newlines)
+# so the streaming reader's buffer stays bounded.
+MAX_LINE_LENGTH = 1024 * 1024
+
+# Only the first failures are kept in detail; the rest are just counted.
+MAX_REPORTED_FAILURES = 1000
+
+
+def normalize_fieldnames(fieldnames):
+    return [(h or "").strip().lower() for h in fieldnames or []]
+
+
+def iter_upload_lines(uploaded_file, encoding="utf-8-sig"):
+    """
+    Yield decoded lines from an UploadedFile without reading it whole.
+
+    Bytes come from ``uploaded_file.chunks()`` and go through an incremental
+    decoder, so multi-byte characters split across chunks are handled and
+    only one chunk plus one partial line is held in memory at a time.
+    Line endings are kept so csv can handle quoted newlines.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    pending = ""
+
+    for chunk in uploaded_file.chunks():
+        lines = (pending + decoder.decode(chunk)).splitlines(keepends=True)
+        # A trailing "\r" may be the first half of "\r\n", so hold it back too.
+        pending = lines.pop() if lines and not lines[-1].endswith("\n") else ""
+        if len(pending) > MAX_LINE_LENGTH:
+            raise ValueError("CSV line too long")
+        yield from lines
+
+    tail = pending + decoder.decode(b"", final=True)
+    if tail:
+        yield from tail.splitlines(keepends=True)
+
+
+def open_csv_upload(uploaded_file):
+    """
+    Return a DictReader streaming over an uploaded CSV with normalized headers.
+    """
+    reader = csv.DictReader(iter_upload_lines(uploaded_file))
+    reader.fieldnames = normalize_fieldnames(reader.fieldnames)
+    return reader
+
+
+def _text(row, key, default=""):
+    return (row.get(key) or default).strip()
+
+
+def _decimal(row, key):
+    raw = _text(row, key, "0")
+    try:
+        value = Decimal(raw)
+    except InvalidOperation:
+        raise ValueError(f"invalid {key} '{raw}'")
+    if not value.is_finite() or value < 0:
+        raise ValueError(f"invalid {key} '{raw}'")
+    return value.quantize(CENTS)
+
+
+def parse_row(row, default_customer="Imported"):
+    """
+    Validate one CSV row and return the cleaned values for its bill.
+    Raises ValueError with a readable message for bad rows.
+    """
+    item_name = _text(row, "item_name")
+    if not item_name:
+        raise ValueError("item_name is required")
+
+    raw_qty = _text(row, "quantity", "0")
+    try:
+        qty = int(raw_qty)
+    except ValueError:
+        raise ValueError(f"invalid quantity '{raw_qty}'")
+    if qty <= 0:
+        raise ValueError("quantity must be positive")
+
+    price = _decimal(row, "price")
+    discount = _decimal(row, "discount")
+
+    total = qty * price
+    if total > MAX_AMOUNT:
+        raise ValueError("amount too large")
+
+    payment_status = _text(row, "payment_status", "UNPAID").upper()
+    if payment_status not in PAYMENT_STATUSES:
+        raise ValueError(f"unknown payment_status '{payment_status}'")
+
+    payment_mode = _text(row, "payment_mode", "CASH").upper()
+    if payment_mode not in PAYMENT_MODES:
+        raise ValueError(f"unknown payment_mode '{payment_mode}'")
+
+    bill_date = None
+    if _text(row, "date"):
+        try:
+            naive_date = datetime.strptime(_text(row, "date"), "%Y-%m-%d")
+            bill_date = timezone.make_aware(naive_date, timezone.get_current_timezone())
+        except ValueError as e:
+            logger.warning(f"Invalid date in row {row}: {e}")
+
+    return {
+        "customer_name": _text(row, "customer_name") or default_customer,
+        "customer_phone": _text(row, "customer_phone"),
+        "customer_email": _text(row, "customer_email"),
+        "item_name": item_name,
+        "quantity": qty,
+        "price": price,
+        "total": total,
+        "discount": discount,
+        "total_amount": max(total - discount, Decimal("0.00")),
+        "payment_status": payment_status,
+        "payment_mode": payment_mode,
+        "created_at": bill_date,
+    }
+
+
+FINGERPRINT_FIELDS = (
+    "item_name", "quantity", "price", "discount", "customer_name",
+    "customer_phone", "customer_email", "payment_status", "payment_mode",
+)
+
+
+def row_fingerprint(parsed, occurrence=0):
+    """
+    Hash a parsed row's content. ``occurrence`` tells apart identical rows
+    within one file (two walk-in sales of the same item), so they are both
+    imported once and both skipped on re-import.
+    """
+    values = [str(parsed[f]) for f in FINGERPRINT_FIELDS]
+    values.append(parsed["created_at"].isoformat() if parsed["created_at"] else "")
+    values.append(str(occurrence))
+    return hashlib.sha256("\x1f".join(values).encode()).hexdigest()
+
+
+def _known_fingerprints(business, source, fingerprints):
+    return set(
+        Bill.objects.filter(
+            business=business,
+            import_source=source,
+            import_fingerprint__in=fingerprints,
+        ).values_list("import_fingerprint", flat=True)
+    )
+
+
+def _write_batch(business, source, parsed):
+    """
+    Insert one batch of parsed rows (header, item and payment per row)
+    inside a single transaction.
+    """
+    now = timezone.now()
+
+    with transaction.atomic():
+        bill_numbers = reserve_bill_numbers(business, len(parsed))
+
+        bills = Bill.objects.bulk_create([
+            Bill(
+                business=business,
+                bill_number=bill_number,
+                customer_name=p["customer_name"],
+                customer_phone=p["customer_phone"],
+                customer_email=p["customer_email"],
+                subtotal=p["total"],
+                discount=p["discount"],
+                total_amount=p["total_amount"],
+                payment_status=p["payment_status"],
+                created_at=p["created_at"] or now,
+                import_source=source,
+                import_fingerprint=p["fingerprint"],
+            )
+            for bill_number, (_, p) in zip(bill_numbers, parsed)
+        ])
+
+        items = BillItem.objects.bulk_create([
+            BillItem(
+                bill=bill,
+                item_name=p["item_name"],
+                quantity=p["quantity"],
+                price=p["price"],
+                total=p["total"],
+            )
+            for bill, (_, p) in zip(bills, parsed)
+        ])
+
+        Payment.objects.bulk_create([
+            Payment(bill=bill, method=p["payment_mode"], reference_id=None)
+            for bill, (_, p) in zip(bills, parsed)
+            if p["payment_status"] == "PAID"
+        ])
+
+        add_bills(bills, items)
+        link_customers(bills)
+
+    return len(bills)
+
+
+def import_rows(
+    business,
+    rows,
+    batch_size=BATCH_SIZE,
+    default_customer="Imported",
+    source="csv",
+    start_row=0,
+    on_batch=None,
+):
+    """
+    Import an iterable of CSV row dicts for a business.
+
+    Rows are validated as they stream in and written in batches of
+    ``batch_size``, one transaction per batch. Returns a dict with the
+    number of bills created, the total number of failed rows and a list
+    of the first ``{"row", "error"}`` failures (row numbers are 1-based
+    data rows, excluding the header).
+
+    Every bill is stamped with ``source`` and a content fingerprint. Rows
+    already imported from the same source are looked up once per batch
+    and counted as ``skipped`` instead of being created again.
+
+    Rows up to ``start_row`` are skipped, which lets an interrupted import
+    resume. ``on_batch(result, last_row)`` is called inside each batch's
+    transaction, so progress saved there commits together with the rows.
+    """
+    result = {"created": 0, "skipped": 0, "failed_count": 0, "failed": []}
+    batch = []
+    occurrences = Counter()
+
+    def fail(idx, error):
+        result["failed_count"] += 1
+        if len(result["failed"]) < MAX_REPORTED_FAILURES:
+            result["failed"].append({"row": idx, "error": error})
+
+    def write(rows):
+        known = _known_fingerprints(business, source, [p["fingerprint"] for _, p in rows])
+        new_rows = [(idx, p) for idx, p in rows if p["fingerprint"] not in known]
+        created = _write_batch(business, source, new_rows) if new_rows else 0
+        result["created"] += created
+        result["skipped"] += len(rows) - len(new_rows)
+
+    def attempt(rows):
+        # Every attempt gets its own savepoint, so a failed lookup or write
+        # leaves the outer transaction usable for the retry and on_batch.
+        with transaction.atomic():
+            write(rows)
+
+    def flush(last_row):
+        with transaction.atomic():
+            if batch:
+                try:
+                    try:
+                        attempt(batch)
+                    except IntegrityError:
+                        # A concurrent import of the same source won the race, or
+                        # a bill number clashed with a legacy one; look the
+                        # fingerprints up again and retry with fresh numbers.
+                        attempt(batch)
+                except Exception as e:
+                    logger.error(f"Import batch failed for rows {batch[0][0]}-{batch[-1][0]}: {e}")
+                    for idx, _ in batch:
+                        fail(idx, str(e))
+            if on_batch:
+                on_batch(result, last_row)
+        batch.clear()
+
+    idx = start_row
+    for idx, row in enumerate(rows, start=1):
+        try:
+            parsed = parse_row(row, default_customer)
+        except ValueError as e:
+            if idx > start_row:
+                fail(idx, str(e))
+            continue
+
+        # Skipped rows on resume still count towards occurrences so the
+        # fingerprints match those written by the interrupted run.
+        content = row_fingerprint(parsed)
+        parsed["fingerprint"] = row_fingerprint(parsed, occurrences[content])
+        occurrences[content] += 1
+
+        if idx <= start_row:
+            continue
+
+        batch.append((idx, parsed))
+
+        if len(batch) >= batch_size:
+            flush(idx)
+
+    flush(max(idx, start_row))
+
+    return result
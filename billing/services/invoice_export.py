@@ -0,0 +1,80 @@
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import django
+
+from analytics_engine.services.utils.date_ranges import parse_date
+from billing.invoice_pdf import get_invoice_pdf, invoice_file_stem
+from billing.models import ReportJob
+
+# Bills loaded (with their items) and handed to the pool at a time.
+CHUNK_SIZE = 200
+
+# Ranges with more bills than this are zipped by run_report_worker; smaller
+# ones are rendered in the request, one at a time.
+SYNC_ZIP_MAX_BILLS = 20
+
+
+def default_workers():
+    return max(1, min(os.cpu_count() or 1, 8))
+
+
+def _init_worker():
+    # Needed when the pool spawns fresh interpreters (Windows / macOS).
+    django.setup()
+
+
+def _render(bill):
+    """
+    Render one invoice in a worker. The bill arrives with its business and
+    items already loaded, so workers never touch the database.
+    """
+    return f"{invoice_file_stem(bill)}.pdf", get_invoice_pdf(bill, bill.business)
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def export_invoices_zip(bills, fileobj, workers=None):
+    """
+    Write the invoice PDF of every bill in ``bills`` into a ZIP on ``fileobj``.
+
+    Bills are read in chunks with items prefetched per chunk. ReportLab is
+    CPU bound, so PDFs are rendered by a process pool; unchanged invoices
+    come straight from the PDF cache. Returns the number of invoices.
+    """
+    workers = workers or default_workers()
+    bills = bills.select_related("business").prefetch_related("items").order_by("created_at", "id")
+
+    count = 0
+    # PDFs are already compressed, so store them as-is.
+    with zipfile.ZipFile(fileobj, "w", compression=zipfile.ZIP_STORED) as archive:
+        if workers == 1:
+            for bill in bills.iterator(chunk_size=CHUNK_SIZE):
+                arcname, pdf_path = _render(bill)
+                archive.write(pdf_path, arcname)
+                count += 1
+            return count
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            for chunk in _chunks(bills.iterator(chunk_size=CHUNK_SIZE), CHUNK_SIZE):
+                for arcname, pdf_path in pool.map(_render, chunk, chunksize=8):
+                    archive.write(pdf_path, arcname)
+                    count += 1
+
+    return count
+
+
+def enqueue_invoices_zip(business, from_date=None, to_date=None):
+    """Queue an invoice ZIP over ``from_date..to_date``, like a sales report."""
+    return ReportJob.objects.create(
+        business=business,
+        kind="INVOICES_ZIP",
+        from_date=parse_date(from_date),
+        to_date=parse_date(to_date),
+    )
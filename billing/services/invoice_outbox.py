@@ -0,0 +1,110 @@
+import logging
+from datetime import timedelta
+
+from django.core.mail import get_connection
+from django.db.models import Q
+from django.utils import timezone
+
+from billing.invoice_pdf import get_invoice_pdf
+from billing.models import Bill, InvoiceOutbox
+from billing.utils import send_invoice_email
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 20
+MAX_ATTEMPTS = 5
+RETRY_BASE_DELAY = timedelta(minutes=1)
+RETRY_MAX_DELAY = timedelta(hours=1)
+# A SENDING row older than this belongs to a worker that died mid-batch.
+STALE_AFTER = timedelta(minutes=10)
+
+
+def retry_delay(attempts):
+    """Exponential backoff: 1, 2, 4, ... minutes, capped at an hour."""
+    return min(RETRY_BASE_DELAY * 2 ** (attempts - 1), RETRY_MAX_DELAY)
+
+
+def claim_due_messages(limit=BATCH_SIZE):
+    """
+    Lock up to ``limit`` due outbox rows for this worker by flipping them to
+    SENDING with a compare-and-set update.
+    """
+    now = timezone.now()
+    due = InvoiceOutbox.objects.filter(
+        Q(status="PENDING", next_attempt_at__lte=now)
+        | Q(status="SENDING", locked_at__lt=now - STALE_AFTER)
+    ).order_by("next_attempt_at").values_list("id", "status", "locked_at")[:limit]
+
+    claimed_ids = [
+        msg_id
+        for msg_id, status, locked_at in due
+        if InvoiceOutbox.objects.filter(
+            id=msg_id, status=status, locked_at=locked_at
+        ).update(status="SENDING", locked_at=now)
+    ]
+
+    return list(
+        InvoiceOutbox.objects
+        .filter(id__in=claimed_ids)
+        .select_related("bill__business")
+        .prefetch_related("bill__items")
+    )
+
+
+def _mark_sent(message):
+    now = timezone.now()
+    message.status = "SENT"
+    message.attempts += 1
+    message.sent_at = now
+    message.last_error = ""
+    message.save(update_fields=["status", "attempts", "sent_at", "last_error"])
+    Bill.objects.filter(id=message.bill_id).update(email_status="SENT")
+
+
+def _mark_failed(message, error):
+    message.attempts += 1
+    message.last_error = str(error)
+
+    if message.attempts >= MAX_ATTEMPTS:
+        message.status = "FAILED"
+        Bill.objects.filter(id=message.bill_id).update(email_status="FAILED")
+    else:
+        message.status = "PENDING"
+        message.next_attempt_at = timezone.now() + retry_delay(message.attempts)
+
+    message.save(update_fields=["status", "attempts", "last_error", "next_attempt_at"])
+
+
+def deliver(messages):
+    """
+    Render and send a batch of claimed invoices over one SMTP connection.
+    Returns ``(sent, failed)`` counts.
+    """
+    sent = failed = 0
+    connection = get_connection()
+
+    try:
+        connection.open()
+    except Exception as e:
+        logger.warning(f"Could not connect to mail server: {e}")
+        for message in messages:
+            _mark_failed(message, e)
+        return 0, len(messages)
+
+    try:
+        for message in messages:
+            bill = message.bill
+            try:
+                pdf_path = get_invoice_pdf(bill, bill.business)
+                send_invoice_email(bill, pdf_path, connection=connection)
+            except Exception as e:
+                logger.warning(f"Invoice email for {bill.bill_number} failed: {e}")
+                _mark_failed(message, e)
+                failed += 1
+            else:
+                _mark_sent(message)
+                sent += 1
+    finally:
+        connection.close()
+
+    return sent, failed
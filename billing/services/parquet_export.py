@@ -0,0 +1,111 @@
+from django.core.exceptions import ImproperlyConfigured
+
+from billing.models import BillItem
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional: only needed for Parquet exports
+    pa = pq = None
+
+# Rows per Parquet row group, and per database round trip.
+ROW_GROUP_SIZE = 50_000
+
+BILL_COLUMNS = (
+    "id", "bill_number", "created_at", "customer_name", "customer_phone",
+    "subtotal", "discount", "total_amount",
+    "payment_status", "payment__method", "is_deleted",
+)
+
+ITEM_COLUMNS = (
+    "bill_id", "bill__bill_number", "item_name", "quantity", "price", "total",
+)
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImproperlyConfigured(
+            "Parquet export needs pyarrow. Install it with 'pip install pyarrow'."
+        )
+
+
+def bill_schema():
+    # Money columns mirror the model's DecimalField(max_digits=10, decimal_places=2).
+    money = pa.decimal128(10, 2)
+    return pa.schema([
+        ("bill_id", pa.int64()),
+        ("bill_number", pa.string()),
+        ("created_at", pa.timestamp("us", tz="UTC")),
+        ("customer_name", pa.string()),
+        ("customer_phone", pa.string()),
+        ("subtotal", money),
+        ("discount", money),
+        ("total_amount", money),
+        ("payment_status", pa.string()),
+        ("payment_method", pa.string()),
+        ("is_deleted", pa.bool_()),
+    ])
+
+
+def item_schema():
+    money = pa.decimal128(10, 2)
+    return pa.schema([
+        ("bill_id", pa.int64()),
+        ("bill_number", pa.string()),
+        ("item_name", pa.string()),
+        ("quantity", pa.int64()),
+        ("price", money),
+        ("total", money),
+    ])
+
+
+def _write_table(rows, schema, fileobj, row_group_size):
+    """
+    Write ``values_list`` tuples as Parquet, one row group per batch, so
+    only ``row_group_size`` rows are in memory at a time.
+    """
+    count = 0
+    with pq.ParquetWriter(fileobj, schema, compression="snappy") as writer:
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= row_group_size:
+                writer.write_batch(_record_batch(batch, schema))
+                count += len(batch)
+                batch = []
+        if batch or not count:
+            writer.write_batch(_record_batch(batch, schema))
+            count += len(batch)
+    return count
+
+
+def _record_batch(rows, schema):
+    columns = list(zip(*rows)) or [[] for _ in schema]
+    return pa.record_batch(
+        [pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+        schema=schema,
+    )
+
+
+def write_bills_parquet(bills, fileobj, row_group_size=ROW_GROUP_SIZE):
+    """Write ``bills`` as Parquet to ``fileobj``. Returns the row count."""
+    _require_pyarrow()
+    rows = (
+        bills.order_by("created_at", "id")
+        .values_list(*BILL_COLUMNS)
+        .iterator(chunk_size=row_group_size)
+    )
+    return _write_table(rows, bill_schema(), fileobj, row_group_size)
+
+
+def write_items_parquet(bills, fileobj, row_group_size=ROW_GROUP_SIZE):
+    """Write the items of ``bills`` as Parquet to ``fileobj``. Returns the row count."""
+    _require_pyarrow()
+    rows = (
+        BillItem.objects
+        .filter(bill__in=bills.order_by().values("id"))
+        .order_by("bill__created_at", "bill_id", "id")
+        .values_list(*ITEM_COLUMNS)
+        .iterator(chunk_size=row_group_size)
+    )
+    return _write_table(rows, item_schema(), fileobj, row_group_size)
@@ -0,0 +1,220 @@
+import logging
+import tempfile
+from datetime import timedelta
+
+from django.core.files import File
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from reportlab.lib.colors import white
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.units import mm
+from reportlab.platypus import LongTable, Paragraph, SimpleDocTemplate, Spacer, TableStyle
+
+from analytics_engine.services.utils.date_ranges import business_timezone, parse_date
+from billing.invoice_pdf import IVORY, LIGHT_GRAY, NAVY
+from billing.models import Bill, ReportJob
+from billing.services.exports import EXPORT_CHUNK_SIZE, filter_bills_by_dates
+from billing.services.invoice_export import export_invoices_zip
+
+logger = logging.getLogger(__name__)
+
+# Ranges with more bills than this are rendered by run_report_worker.
+SYNC_REPORT_MAX_BILLS = 2000
+
+# A RUNNING report older than this belongs to a worker that died.
+STALE_AFTER = timedelta(minutes=30)
+MAX_ATTEMPTS = 3
+
+# Download name suffix and content type of each ReportJob kind.
+REPORT_FILES = {
+    "SALES_PDF": ("sales.pdf", "application/pdf"),
+    "INVOICES_ZIP": ("invoices.zip", "application/zip"),
+}
+
+REPORT_HEADER = ["Bill", "Time", "Customer", "Total", "Status"]
+COLUMN_WIDTHS = [50 * mm, 20 * mm, 55 * mm, 30 * mm, 20 * mm]
+
+TABLE_STYLE = TableStyle([
+    ("BACKGROUND", (0, 0), (-1, 0), NAVY),
+    ("TEXTCOLOR", (0, 0), (-1, 0), white),
+    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+    ("FONTSIZE", (0, 0), (-1, -1), 8),
+    ("ALIGN", (3, 0), (3, -1), "RIGHT"),
+    ("LINEBELOW", (0, 0), (-1, -1), 0.25, LIGHT_GRAY),
+    ("BACKGROUND", (0, -1), (-1, -1), IVORY),
+    ("FONTNAME", (0, -1), (-1, -1), "Helvetica-Bold"),
+])
+
+
+def daily_subtotals(bills):
+    """
+    Bill count and total per local day, computed in one grouped query.
+    Days are those of the rollups (``business_timezone``).
+    """
+    rows = (
+        bills.order_by()
+        .annotate(day=TruncDate("created_at", tzinfo=business_timezone()))
+        .values("day")
+        .annotate(bill_count=Count("id"), total=Sum("total_amount"))
+    )
+    return {row["day"]: row for row in rows}
+
+
+def _iter_days(bills):
+    """Yield ``(day, rows)`` per local day, reading bills in chunks."""
+    rows = (
+        bills.order_by("created_at", "id")
+        .values_list("bill_number", "created_at", "customer_name", "total_amount", "payment_status")
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+
+    tz = business_timezone()
+    day, day_rows = None, []
+    for number, created_at, customer, total, status in rows:
+        created_at = timezone.localtime(created_at, tz)
+        if created_at.date() != day:
+            if day_rows:
+                yield day, day_rows
+            day, day_rows = created_at.date(), []
+        day_rows.append([
+            number,
+            created_at.strftime("%H:%M"),
+            (customer or "Walk-in")[:40],
+            f"₹{total}",
+            status,
+        ])
+
+    if day_rows:
+        yield day, day_rows
+
+
+def write_sales_report_pdf(business, bills, fileobj):
+    """
+    Write the multi-page sales report to ``fileobj``: one section per day
+    whose table splits across pages with a repeated header and ends in the
+    day's subtotal, then a grand total. Returns the number of bills.
+    """
+    styles = getSampleStyleSheet()
+    subtotals = daily_subtotals(bills)
+    grand = bills.aggregate(bill_count=Count("id"), total=Sum("total_amount"))
+
+    elements = [
+        Paragraph(
+            f"<b>BizSight Sales Report</b><br/>{business.name}",
+            styles["Title"],
+        ),
+        Spacer(1, 12),
+    ]
+
+    for day, rows in _iter_days(bills):
+        subtotal = subtotals.get(day, {"bill_count": len(rows), "total": 0})
+        elements.append(Paragraph(day.strftime("%d-%m-%Y"), styles["Heading3"]))
+        table = LongTable(
+            [REPORT_HEADER]
+            + rows
+            + [[f"{subtotal['bill_count']} bills", "", "Day total", f"₹{subtotal['total']}", ""]],
+            colWidths=COLUMN_WIDTHS,
+            repeatRows=1,
+        )
+        table.setStyle(TABLE_STYLE)
+        elements.append(table)
+        elements.append(Spacer(1, 8))
+
+    elements.append(
+        Paragraph(
+            f"<b>Total: ₹{grand['total'] or 0} across {grand['bill_count']} bills</b>",
+            styles["Heading2"],
+        )
+    )
+
+    SimpleDocTemplate(fileobj, pagesize=A4).build(elements)
+    return grand["bill_count"]
+
+
+def enqueue_sales_report(business, from_date=None, to_date=None):
+    """
+    Queue a report over ``from_date..to_date``. Blank or invalid dates
+    leave that side open, as they do for the synchronous report.
+    """
+    return ReportJob.objects.create(
+        business=business,
+        from_date=parse_date(from_date),
+        to_date=parse_date(to_date),
+    )
+
+
+def claim_next_report(stale_after=STALE_AFTER):
+    """
+    Atomically take the oldest pending report, or one whose worker died
+    mid-render. Returns None when the queue is empty.
+    """
+    now = timezone.now()
+    claimable = ReportJob.objects.filter(
+        Q(status="PENDING")
+        | Q(status="RUNNING", started_at__lt=now - stale_after)
+    )
+
+    for job in claimable.order_by("created_at")[:10]:
+        claimed = ReportJob.objects.filter(
+            id=job.id,
+            status=job.status,
+            started_at=job.started_at,
+        ).update(
+            status="RUNNING",
+            attempts=job.attempts + 1,
+            started_at=now,
+        )
+        if claimed:
+            job.refresh_from_db()
+            return job
+
+    return None
+
+
+def _write_report(job, bills, fileobj, workers=None):
+    if job.kind == "INVOICES_ZIP":
+        return export_invoices_zip(bills.filter(is_deleted=False), fileobj, workers=workers)
+    return write_sales_report_pdf(job.business, bills, fileobj)
+
+
+def run_report_job(job, workers=None):
+    """
+    Render ``job`` into its file. Invoice ZIPs use a pool of ``workers``
+    processes (see ``export_invoices_zip``).
+    """
+    bills = filter_bills_by_dates(
+        Bill.objects.filter(business=job.business),
+        job.from_date,
+        job.to_date,
+    )
+    suffix, _ = REPORT_FILES[job.kind]
+    stem, extension = suffix.rsplit(".", 1)
+
+    try:
+        with tempfile.TemporaryFile() as tmp:
+            job.bill_count = _write_report(job, bills, tmp, workers=workers)
+            tmp.seek(0)
+            job.file.save(
+                f"BS_{timezone.now().year}_{job.business.name}_{stem}_{job.id}.{extension}",
+                File(tmp),
+                save=False,
+            )
+    except Exception as e:
+        logger.exception(f"Report job {job.id} failed")
+        job.message = str(e)
+        if job.attempts >= MAX_ATTEMPTS:
+            job.status = "FAILED"
+            job.finished_at = timezone.now()
+        else:
+            job.status = "PENDING"
+        job.save(update_fields=["status", "message", "finished_at"])
+        return job
+
+    job.status = "COMPLETED"
+    job.finished_at = timezone.now()
+    job.message = f"{job.bill_count} bills"
+    job.save(update_fields=["status", "file", "bill_count", "finished_at", "message"])
+
+    return job
@@ -1,3 +1,316 @@
-from django.test import TestCase
+import shutil
+import tempfile
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from accounts.models import Business
+from billing.management.commands.check_bill_indexes import checked_queries
+from billing.models import Bill, ImportJob, InvoiceOutbox
+from billing.services import importer
+from billing.services.bill_numbers import reserve_bill_numbers
+from billing.services.bills import create_bill, delete_bills, mark_paid
+from billing.services import change_feed, invoice_outbox
+from billing.services.import_jobs import claim_next_job, enqueue_csv_import, run_import_job
+from billing.services.sales_report import _iter_days, daily_subtotals
+
+
+def make_business(username="owner"):
+    user = User.objects.create_user(username=username, password="x")
+    return Business.objects.create(user=user, name=f"{username} shop")
+
+
+def csv_rows(count, start=0):
+    return [
+        {"item_name": f"Item {n}", "quantity": "1", "price": f"{10 + n}.00", "payment_status": "PAID"}
+        for n in range(start, start + count)
+    ]
+
+
+class BillIndexTests(TestCase):
+    """The date-range bill queries must keep using their composite index."""
+
+    def test_date_range_queries_use_index(self):
+        for label, queryset, indexes in checked_queries(business_id=1):
+            with self.subTest(label):
+                plan = queryset.explain()
+                self.assertTrue(
+                    any(index in plan for index in indexes),
+                    f"expected {' or '.join(indexes)}, got: {plan}",
+                )
+
+
+class BillNumberTests(TestCase):
+    def setUp(self):
+        self.business = make_business()
+
+    def test_blocks_are_consecutive(self):
+        first = reserve_bill_numbers(self.business, 2, year=2026)
+        second = reserve_bill_numbers(self.business, 1, year=2026)
+        self.assertEqual(
+            first + second,
+            ["BS_2026_OWNERSHOP-000001", "BS_2026_OWNERSHOP-000002", "BS_2026_OWNERSHOP-000003"],
+        )
+
+    def test_rolled_back_block_is_reused(self):
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            reserve_bill_numbers(self.business, 3, year=2026)
+            raise RuntimeError
+        self.assertEqual(reserve_bill_numbers(self.business, 1, year=2026), ["BS_2026_OWNERSHOP-000001"])
+
+    def test_year_is_the_local_year(self):
+        # 1 January 00:30 in the local timezone is still 31 December in UTC.
+        now = timezone.make_aware(datetime(2027, 1, 1, 0, 30)).astimezone(dt_timezone.utc)
+        self.assertEqual(now.year, 2026)
+        with mock.patch("django.utils.timezone.now", return_value=now):
+            self.assertEqual(reserve_bill_numbers(self.business, 1), ["BS_2027_OWNERSHOP-000001"])
+
+
+class ImportRowsTests(TestCase):
+    def setUp(self):
+        self.business = make_business()
+
+    def test_database_error_fails_only_its_batch(self):
+        lookup = importer._known_fingerprints
+        calls = []
+
+        def broken_lookup(business, source, fingerprints):
+            calls.append(fingerprints)
+            if len(calls) == 1:
+                # A database error that leaves the open transaction unusable,
+                # as any error does on PostgreSQL.
+                with transaction.mark_for_rollback_on_error():
+                    connection.cursor().execute("SELECT * FROM no_such_table")
+            return lookup(business, source, fingerprints)
+
+        progress = []
+        with mock.patch.object(importer, "_known_fingerprints", broken_lookup), self.assertLogs(importer.logger):
+            result = importer.import_rows(
+                self.business,
+                csv_rows(4),
+                batch_size=2,
+                on_batch=lambda result, last_row: progress.append((last_row, Bill.objects.count())),
+            )
+
+        self.assertEqual(result["created"], 2)
+        self.assertEqual([failure["row"] for failure in result["failed"]], [1, 2])
+        self.assertEqual(progress, [(2, 0), (4, 2), (4, 2)])
+
+    def test_reimport_skips_known_rows(self):
+        rows = csv_rows(3)
+        # Two identical sales are two bills, not one row imported twice.
+        rows.append(dict(rows[0]))
+
+        first = importer.import_rows(self.business, rows, batch_size=2)
+        again = importer.import_rows(self.business, rows + csv_rows(1, start=3), batch_size=2)
+
+        self.assertEqual((first["created"], first["skipped"]), (4, 0))
+        self.assertEqual((again["created"], again["skipped"]), (1, 4))
+        self.assertEqual(Bill.objects.filter(business=self.business).count(), 5)
+
+    def test_sources_are_fingerprinted_separately(self):
+        importer.import_rows(self.business, csv_rows(2), source="csv")
+        result = importer.import_rows(self.business, csv_rows(2), source="sheet:a")
+        self.assertEqual((result["created"], result["skipped"]), (2, 0))
+
+    def test_resume_matches_an_uninterrupted_run(self):
+        rows = csv_rows(2) + csv_rows(2)
+        importer.import_rows(self.business, rows[:3])
+
+        # The resumed run must still count the repeats before start_row, or
+        # the fourth row would look like the first occurrence and be skipped.
+        result = importer.import_rows(self.business, rows, start_row=3)
+
+        self.assertEqual((result["created"], result["skipped"]), (1, 0))
+        self.assertEqual(Bill.objects.filter(business=self.business).count(), 4)
+
+
+def use_temporary_media(testcase):
+    """Point MEDIA_ROOT at a directory removed when ``testcase`` ends."""
+    media_root = tempfile.mkdtemp()
+    testcase.addCleanup(shutil.rmtree, media_root)
+    settings = override_settings(MEDIA_ROOT=media_root)
+    settings.enable()
+    testcase.addCleanup(settings.disable)
+
+
+class ImportJobTests(TestCase):
+    def setUp(self):
+        self.business = make_business()
+        use_temporary_media(self)
+
+    def enqueue(self, rows):
+        lines = ["item_name,quantity,price,payment_status"]
+        lines += [f"{r['item_name']},{r['quantity']},{r['price']},{r['payment_status']}" for r in rows]
+        upload = SimpleUploadedFile("sales.csv", "\n".join(lines).encode())
+        return enqueue_csv_import(self.business, upload)
+
+    def test_job_runs_to_completion(self):
+        job = self.enqueue(csv_rows(3))
+        job = run_import_job(claim_next_job())
+
+        self.assertEqual(job.status, "COMPLETED")
+        self.assertEqual((job.total_rows, job.rows_processed, job.bills_created), (3, 3, 3))
+
+    def test_crashed_job_resumes_after_its_last_batch(self):
+        rows = csv_rows(4)
+        job = self.enqueue(rows)
+        self.assertEqual(claim_next_job(), job)
+
+        # The worker committed the first two rows, then stopped heartbeating.
+        importer.import_rows(self.business, rows[:2])
+        ImportJob.objects.filter(id=job.id).update(
+            rows_processed=2,
+            bills_created=2,
+            heartbeat_at=timezone.now() - timedelta(hours=1),
+        )
+
+        job = claim_next_job()
+        self.assertEqual(job.attempts, 2)
+        self.assertIsNone(claim_next_job())
+        job = run_import_job(job)
+
+        self.assertEqual(job.status, "COMPLETED")
+        self.assertEqual((job.rows_processed, job.bills_created, job.skipped_count), (4, 4, 0))
+        self.assertEqual(Bill.objects.filter(business=self.business).count(), 4)
+
+    def test_running_job_with_a_heartbeat_is_not_claimed(self):
+        self.enqueue(csv_rows(1))
+        claim_next_job()
+        self.assertIsNone(claim_next_job())
+
+
+class InvoiceOutboxTests(TestCase):
+    def setUp(self):
+        use_temporary_media(self)
+        self.bill = create_bill(
+            make_business(),
+            [("Thali", 3, Decimal("2000.00"))],
+            payment_mode="CASH",
+            customer_email="guest@example.com",
+        )
+        self.message = InvoiceOutbox.objects.get(bill=self.bill)
+
+    def deliver_due(self):
+        return invoice_outbox.deliver(invoice_outbox.claim_due_messages())
+
+    def make_due(self):
+        InvoiceOutbox.objects.filter(id=self.message.id).update(next_attempt_at=timezone.now())
+
+    def test_large_bill_is_emailed_once(self):
+        self.assertEqual(self.deliver_due(), (1, 0))
+        self.assertEqual(self.deliver_due(), (0, 0))
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ["guest@example.com"])
+        self.message.refresh_from_db()
+        self.assertEqual((self.message.status, self.message.attempts), ("SENT", 1))
+        self.assertEqual(Bill.objects.get(id=self.bill.id).email_status, "SENT")
+
+    def test_failures_back_off_then_give_up(self):
+        failing = mock.patch.object(invoice_outbox, "send_invoice_email", side_effect=OSError("smtp down"))
+        with failing, self.assertLogs(invoice_outbox.logger, "WARNING"):
+            self.assertEqual(self.deliver_due(), (0, 1))
+
+            self.message.refresh_from_db()
+            self.assertEqual((self.message.status, self.message.attempts), ("PENDING", 1))
+            self.assertGreater(self.message.next_attempt_at, timezone.now() + timedelta(seconds=50))
+            # Not due again until the backoff has passed.
+            self.assertEqual(invoice_outbox.claim_due_messages(), [])
+
+            for _ in range(invoice_outbox.MAX_ATTEMPTS - 1):
+                self.make_due()
+                self.deliver_due()
+
+        self.message.refresh_from_db()
+        self.assertEqual((self.message.status, self.message.attempts), ("FAILED", invoice_outbox.MAX_ATTEMPTS))
+        self.assertEqual(self.message.last_error, "smtp down")
+        self.assertEqual(Bill.objects.get(id=self.bill.id).email_status, "FAILED")
+
+        self.make_due()
+        self.assertEqual(invoice_outbox.claim_due_messages(), [])
+
+    def test_stale_claim_is_taken_over(self):
+        self.assertEqual(len(invoice_outbox.claim_due_messages()), 1)
+        # Claimed by a live worker.
+        self.assertEqual(invoice_outbox.claim_due_messages(), [])
+
+        InvoiceOutbox.objects.filter(id=self.message.id).update(
+            locked_at=timezone.now() - invoice_outbox.STALE_AFTER - timedelta(minutes=1),
+        )
+        self.assertEqual(self.deliver_due(), (1, 0))
+        self.assertEqual(len(mail.outbox), 1)
+
+
+class ChangeFeedTests(TestCase):
+    def setUp(self):
+        self.business = make_business()
+        self.bills = [
+            create_bill(self.business, [("Tea", 1, Decimal(n + 10))], payment_status="UNPAID")
+            for n in range(5)
+        ]
+        # All in the same instant, so only the id tells them apart.
+        self.changed_at = timezone.now() - timedelta(minutes=1)
+        Bill.objects.filter(business=self.business).update(updated_at=self.changed_at)
+
+    def read_all(self, cursor=None, limit=2):
+        ids = []
+        while True:
+            page = change_feed.get_changes(self.business, cursor, limit=limit)
+            ids += [change["id"] for change in page["changes"]]
+            cursor = page["next_cursor"]
+            if not page["has_more"]:
+                return ids, cursor
+
+    def test_pages_return_every_change_once(self):
+        ids, cursor = self.read_all()
+        self.assertEqual(ids, [bill.id for bill in self.bills])
+
+        page = change_feed.get_changes(self.business, cursor)
+        self.assertEqual((page["changes"], page["next_cursor"]), ([], cursor))
+
+    def test_later_changes_follow_the_cursor(self):
+        _, cursor = self.read_all()
+        paid, deleted = self.bills[1], self.bills[3]
+        mark_paid(paid)
+        delete_bills(self.business, [deleted.id])
+
+        # Changes newer than SAFETY_LAG wait for a later poll.
+        self.assertEqual(change_feed.get_changes(self.business, cursor)["changes"], [])
+
+        later = timezone.now() + change_feed.SAFETY_LAG * 2
+        with mock.patch("django.utils.timezone.now", return_value=later):
+            changes = change_feed.get_changes(self.business, cursor)["changes"]
+
+        self.assertEqual(
+            [(change["id"], change["op"], change["payment_status"]) for change in changes],
+            [(paid.id, "upsert", "PAID"), (deleted.id, "delete", "UNPAID")],
+        )
+
+    def test_invalid_cursor(self):
+        with self.assertRaises(ValueError):
+            change_feed.get_changes(self.business, "not-a-cursor")
+
+
+class SalesReportTests(TestCase):
+    def test_days_follow_the_business_timezone(self):
+        business = make_business()
+        bill = create_bill(business, [("Tea", 2, Decimal("15.00"))], payment_mode="CASH")
+        # 20:00 UTC is 01:30 the next day in Asia/Kolkata.
+        Bill.objects.filter(id=bill.id).update(created_at=datetime(2026, 3, 9, 20, 0, tzinfo=dt_timezone.utc))
+        bills = Bill.objects.filter(business=business)
+
+        with timezone.override("UTC"):
+            subtotals = daily_subtotals(bills)
+            days = [day for day, _ in _iter_days(bills)]
+
+        self.assertEqual(list(subtotals), [date(2026, 3, 10)])
+        self.assertEqual(days, [date(2026, 3, 10)])
+        self.assertEqual(subtotals[date(2026, 3, 10)]["total"], Decimal("30.00"))
@@ -19,10 +19,16 @@ urlpatterns = [
 
     path("import/google-sheet/", views.import_google_sheet_view, name="import_google_sheet"),
     path("import-csv/", views.import_csv_file_view, name="import_csv_file"),
+    path("import/jobs/<int:job_id>/status/", views.import_job_status_view, name="import_job_status"),
 
     path("download/csv/", views.download_sales_csv, name="download_sales_csv"),
     path("download/excel/", views.download_sales_excel, name="download_sales_excel"),
+    path("download/parquet/", views.download_sales_parquet, name="download_sales_parquet"),
     path("download/pdf/", views.download_sales_pdf, name="download_sales_pdf"),
+    path("download/invoices/", views.download_invoices_zip, name="download_invoices_zip"),
+    path("changes/", views.bill_changes_view, name="bill_changes"),
+    path("reports/<int:job_id>/status/", views.report_job_status_view, name="report_job_status"),
+    path("reports/<int:job_id>/download/", views.download_report_view, name="download_report"),
 ]
 
 if settings.DEBUG:
@@ -1,3 +1,5 @@
+import hashlib
+import os
 import qrcode
 from PIL import Image
 from pathlib import Path
@@ -5,7 +7,7 @@ from pathlib import Path
 from django.core.mail import EmailMessage
 from django.template.loader import render_to_string
 
-def send_invoice_email(bill, pdf_path):
+def send_invoice_email(bill, pdf_path, connection=None):
     subject = f"Invoice {bill.bill_number}"
     body = render_to_string("billing/email_invoice.html", {
         "bill": bill
@@ -14,29 +16,67 @@ def send_invoice_email(bill, pdf_path):
     email = EmailMessage(
         subject,
         body,
-        to=[bill.customer_email]
+        to=[bill.customer_email],
+        connection=connection,
     )
+    email.content_subtype = "html"
 
-    email.attach_file(pdf_path)
+    email.attach(
+        f"{bill.bill_number.replace('/', '_')}.pdf",
+        Path(pdf_path).read_bytes(),
+        "application/pdf",
+    )
     email.send()
 
 from django.conf import settings
 
+
+def _file_version(path):
+    stat = Path(path).stat()
+    return f"{path}:{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def _scaled_logo(logo_path, size, cache_dir):
+    """
+    Return the logo resized to ``size`` px, resizing with PIL only the first
+    time for each logo file version and size.
+    """
+    key = hashlib.sha256(_file_version(logo_path).encode()).hexdigest()[:16]
+    scaled_path = cache_dir / "logos" / f"{key}-{size}.png"
+
+    if not scaled_path.exists():
+        scaled_path.parent.mkdir(parents=True, exist_ok=True)
+        logo = Image.open(logo_path).convert("RGBA").resize((size, size))
+        tmp_path = scaled_path.with_suffix(f".{os.getpid()}.tmp")
+        logo.save(tmp_path, format="PNG")
+        os.replace(tmp_path, scaled_path)
+
+    return Image.open(scaled_path)
+
+
 def generate_upi_qr(
     upi_uri: str,
-    bill_number: str,
     logo_path: str = None,
     output_dir: str = None
 ):
+    """
+    Return the path of a QR code PNG for ``upi_uri``.
 
+    Images are cached under a hash of the URI and logo version, so repeat
+    calls for the same bill reuse the file without running the encoder.
+    """
     if output_dir is None:
         output_dir = Path(settings.MEDIA_ROOT) / "qr_codes"
 
     base_dir = Path(output_dir)
     base_dir.mkdir(parents=True, exist_ok=True)
 
-    safe_name = bill_number.replace("/", "_")
-    file_path = base_dir / f"{safe_name}.png"
+    has_logo = bool(logo_path) and Path(logo_path).exists()
+    cache_key = upi_uri + "\x1f" + (_file_version(logo_path) if has_logo else "")
+    file_path = base_dir / f"{hashlib.sha256(cache_key.encode()).hexdigest()[:32]}.png"
+
+    if file_path.exists():
+        return str(file_path)
 
     qr = qrcode.QRCode(
         version=1,
@@ -49,15 +89,15 @@ def generate_upi_qr(
 
     qr_img = qr.make_image(fill_color="black", back_color="white").convert("RGB")
 
-    if logo_path and Path(logo_path).exists():
-        logo = Image.open(logo_path)
+    if has_logo:
         qr_width, qr_height = qr_img.size
         logo_size = qr_width // 4
-        logo = logo.resize((logo_size, logo_size))
+        logo = _scaled_logo(logo_path, logo_size, base_dir)
         pos = ((qr_width - logo_size) // 2, (qr_height - logo_size) // 2)
-        qr_img.paste(logo, pos)
+        qr_img.paste(logo, pos, logo)
 
-    qr_img.save(file_path)
+    tmp_path = file_path.with_suffix(f".{os.getpid()}.tmp")
+    qr_img.save(tmp_path, format="PNG")
+    os.replace(tmp_path, file_path)
 
     return str(file_path)
-
@@ -1,37 +1,101 @@
-from datetime import date, datetime, timedelta
+from datetime import timedelta
 from decimal import Decimal
-from io import BytesIO, StringIO
+from io import StringIO
+from itertools import islice
 import csv
 import json
 import logging
+import tempfile
+from pathlib import Path
 import requests
 
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.db.models import Sum
-from django.http import HttpResponse, FileResponse
+from django.core.exceptions import ImproperlyConfigured
+from django.http import HttpResponse, FileResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import render, redirect, get_object_or_404
+from django.urls import reverse
 from django.utils import timezone
-
-from openpyxl import Workbook
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table
-from reportlab.lib.styles import getSampleStyleSheet
+from django.utils.cache import patch_vary_headers
 
 from accounts.utils import get_current_business
 from analytics_engine.services.sales_metrics import (
+    get_sales_counters,
     get_sales_overview,
-    get_sales_by_day,
-    get_sales_by_month,
 )
+from analytics_engine.services.cache import cached_result
+from analytics_engine.services.cohorts import cohort_retention
+from analytics_engine.services.comparisons import COMPARISONS, compare_periods, previous_window
 from analytics_engine.services.item_metrics import get_top_items
+from analytics_engine.services.rfm import segment_summary
+from analytics_engine.services.rollups import daily_item_sales, daily_sales
+from analytics_engine.services.timeseries import (
+    FREQUENCIES,
+    bill_value_percentiles,
+    load_hourly_series,
+    sales_heatmap,
+    sales_trend,
+)
+from analytics_engine.services.utils.date_ranges import filter_date_range, parse_date
 from analytics_engine.services.smart_insights import get_smart_insights
 from insights.services import get_bizmitra_insights
 
-from billing.utils import send_invoice_email
-from .invoice_pdf import generate_invoice_pdf
+from billing.services.bills import (
+    EMAIL_REQUIRED_AMOUNT,
+    bill_totals,
+    create_bill,
+    delete_bills,
+    mark_paid,
+)
+from billing.services.customers import customer_key
+from billing.services.change_feed import PAGE_SIZE as CHANGE_FEED_PAGE_SIZE, get_changes
+from billing.services.exports import filter_bills_by_dates, iter_sales_csv, write_sales_workbook
+from billing.services.importer import open_csv_upload
+from billing.services.invoice_export import SYNC_ZIP_MAX_BILLS, enqueue_invoices_zip, export_invoices_zip
+from billing.services.import_jobs import enqueue_csv_import, enqueue_sheet_import
+from billing.services.parquet_export import write_bills_parquet, write_items_parquet
+from billing.services.sales_report import REPORT_FILES, SYNC_REPORT_MAX_BILLS, enqueue_sales_report, write_sales_report_pdf
+from .invoice_pdf import get_invoice_pdf, invalidate_invoice_pdf, invoice_file_stem
 from .utils import generate_upi_qr
-from .models import Bill, BillItem, Payment
+from .models import Bill, BillItem, ImportJob, Payment, ReportJob
+
+
+# Window compared when a comparison is picked without a date range.
+COMPARE_DEFAULT_DAYS = 30
+
+
+def _analytics_summary(business, from_date, to_date, group, compare=""):
+    overview = get_sales_overview(daily_sales(business, from_date, to_date))
+    # Every grouping and the heatmap come from the hourly rollup; the bill
+    # value percentiles are ranked in the database.
+    hourly = load_hourly_series(business, from_date, to_date)
+    span = (from_date, to_date) if compare else None
+    trend = sales_trend(hourly, freq=group, span=span)
+
+    comparison = None
+    previous_values = []
+    if compare:
+        comparison = compare_periods(business, from_date, to_date, compare)
+        previous_span = previous_window(from_date, to_date, compare)
+        previous = sales_trend(load_hourly_series(business, *previous_span), freq=group, span=previous_span)
+        # Overlaid bucket by bucket: the n-th period of each window.
+        size = len(trend["totals"])
+        previous_values = (previous["totals"] + [0] * size)[:size]
+
+    return {
+        "overview": overview,
+        "top_items": list(get_top_items(daily_item_sales(business, from_date, to_date))),
+        "insights": get_smart_insights(overview),
+        "chart_labels": trend["labels"],
+        "chart_values": trend["totals"],
+        "chart_rolling": trend["rolling"],
+        "chart_cumulative": trend["cumulative"],
+        "chart_previous": previous_values,
+        "comparison": comparison,
+        "heatmap": sales_heatmap(hourly),
+        "bill_percentiles": bill_value_percentiles(business, from_date, to_date),
+    }
 
 
 def analytics_dashboard_view(request):
@@ -42,43 +106,48 @@ def analytics_dashboard_view(request):
     from_date = request.GET.get("from_date")
     to_date = request.GET.get("to_date")
     group = request.GET.get("group", "day")
-
-    bills = Bill.objects.filter(
-        business=business,
-        is_deleted=False
-    )
-
-    if from_date and from_date.lower() != "none":
-        try:
-            parsed_from = datetime.strptime(from_date, "%Y-%m-%d").date()
-            bills = bills.filter(created_at__date__gte=parsed_from)
-        except ValueError:
-            pass
-
-    if to_date and to_date.lower() != "none":
-        try:
-            parsed_to = datetime.strptime(to_date, "%Y-%m-%d").date()
-            bills = bills.filter(created_at__date__lte=parsed_to)
-        except ValueError:
-            pass
-
-    overview = get_sales_overview(bills)
-
-    sales_trend = (
-        get_sales_by_month(bills)
-        if group == "month"
-        else get_sales_by_day(bills)
+    today = timezone.localdate()
+
+    parsed_from = parse_date(from_date)
+    parsed_to = parse_date(to_date)
+
+    group = group if group in FREQUENCIES else "day"
+
+    compare = request.GET.get("compare", "")
+    compare = compare if compare in COMPARISONS else ""
+    if compare:
+        parsed_to = parsed_to or today
+        parsed_from = parsed_from or parsed_to - timedelta(days=COMPARE_DEFAULT_DAYS - 1)
+        if parsed_from > parsed_to:
+            parsed_from, parsed_to = parsed_to, parsed_from
+        from_date, to_date = parsed_from.isoformat(), parsed_to.isoformat()
+
+    summary = cached_result(
+        business,
+        "analytics_dashboard",
+        lambda: _analytics_summary(business, parsed_from, parsed_to, group, compare),
+        from_date=parsed_from,
+        to_date=parsed_to,
+        group=group,
+        compare=compare,
     )
 
     context = {
-        "overview": overview,
-        "top_items": get_top_items(bills),
-        "insights": get_smart_insights(bills),
-        "chart_labels": [str(r["label"]) for r in sales_trend],
-        "chart_values": [float(r["total"]) for r in sales_trend],
+        **summary,
         "from_date": from_date if from_date and from_date.lower() != "none" else "",
         "to_date": to_date if to_date and to_date.lower() != "none" else "",
         "group": group,
+        "compare": compare,
+        "comparisons": COMPARISONS,
+        "customer_segments": segment_summary(business),
+        "cohorts": cached_result(
+            business,
+            "cohort_retention",
+            lambda: cohort_retention(business, today),
+            month=today.strftime("%Y-%m"),
+        ),
+        "import_jobs": ImportJob.objects.filter(business=business)[:5],
+        "report_jobs": ReportJob.objects.filter(business=business)[:5],
     }
 
     return render(request, "billing/analytics.html", context)
@@ -90,24 +159,12 @@ def dashboard_view(request):
     if not business:
         return redirect("/accounts/login/")
 
-    today = date.today()
-
     bills = Bill.objects.filter(
         business=business,
         is_deleted=False
     )
 
-    bills_today = bills.filter(created_at__date=today)
-
-    metrics = {
-        "today_sales": bills_today.filter(
-            payment_status="PAID"
-        ).aggregate(total=Sum("total_amount"))["total"] or 0,
-        "total_bills": bills.count(),
-        "paid": bills.filter(payment_status="PAID").count(),
-        "unpaid": bills.filter(payment_status="UNPAID").count(),
-        "pay_later": bills.filter(payment_status="PAY_LATER").count(),
-    }
+    metrics = get_sales_counters(daily_sales(business))
 
     context = {
         "today": timezone.now().strftime("%A, %d %B %Y"),
@@ -131,7 +188,6 @@ def create_bill_view(request):
         quantities = request.POST.getlist("quantity[]")
         prices = request.POST.getlist("price[]")
 
-        subtotal = Decimal("0.00")
         items = []
 
         for n, q, p in zip(item_names, quantities, prices):
@@ -143,20 +199,18 @@ def create_bill_view(request):
             except Exception:
                 continue
 
-            t = q * p
-            subtotal += t
-            items.append((n, q, p, t))
+            items.append((n, q, p))
 
         if not items:
             messages.error(request, "Add at least one valid item")
             return redirect("create_bill")
 
         discount = Decimal(request.POST.get("discount") or 0)
-        total_amount = max(subtotal - discount, Decimal("0.00"))
+        _, total_amount = bill_totals(items, discount)
 
         customer_email = request.POST.get("customer_email")
 
-        if total_amount >= 5000 and not customer_email:
+        if total_amount >= EMAIL_REQUIRED_AMOUNT and not customer_email:
             messages.error(
                 request,
                 "Customer email is required for bills above ₹5,000"
@@ -166,41 +220,18 @@ def create_bill_view(request):
         payment_status = request.POST.get("payment_status")
         payment_mode = request.POST.get("payment_mode")
 
-        bill = Bill.objects.create(
-            business=business,
+        bill = create_bill(
+            business,
+            items,
+            discount=discount,
+            payment_status=payment_status,
+            payment_mode=payment_mode,
             customer_name=request.POST.get("customer_name"),
             customer_phone=request.POST.get("customer_phone"),
             customer_email=customer_email,
             customer_address=request.POST.get("customer_address"),
-            subtotal=subtotal,
-            discount=discount,
-            total_amount=total_amount,
-            payment_status=payment_status,
-            email_required=(total_amount >= 5000),
         )
 
-        for n, q, p, t in items:
-            BillItem.objects.create(
-                bill=bill,
-                item_name=n,
-                quantity=q,
-                price=p,
-                total=t,
-            )
-
-        if payment_status == "PAID":
-            Payment.objects.create(
-                bill=bill,
-                method=payment_mode,
-                reference_id=None
-            )
-
-        if bill.email_required:
-            pdf_path = generate_invoice_pdf(bill, business)
-            send_invoice_email(bill, pdf_path)
-            bill.email_sent = True
-            bill.save(update_fields=["email_sent"])
-
         messages.success(request, "Bill created successfully")
 
         if payment_status == "PAID" and payment_mode == "UPI":
@@ -225,16 +256,17 @@ def bill_detail_view(request, bill_id):
     qr_url = None
     qr_error = None
 
-    if bill.payment_status != "paid":
+    if bill.payment_status != "PAID":
         if business.upi_id:
+            logo_path = business.logo.path if business.logo else None
             qr_path = generate_upi_qr(
                 bill.get_upi_payment_uri(
                     upi_id=business.upi_id,
                     payee_name=business.name
                 ),
-                bill.bill_number
+                logo_path=logo_path,
             )
-            qr_url = settings.MEDIA_URL + qr_path.split("media/")[-1]
+            qr_url = settings.MEDIA_URL + Path(qr_path).relative_to(settings.MEDIA_ROOT).as_posix()
         else:
             qr_error = "UPI not configured. Please add UPI ID in Business Settings."
 
@@ -243,7 +275,12 @@ def bill_detail_view(request, bill_id):
         "bill": bill,
         "business": business,
         "qr_url": qr_url,   # will be None if paid
-        "bizmitra_insights": get_bizmitra_insights(business),
+        "bizmitra_insights": cached_result(
+            business,
+            "bizmitra_insights",
+            lambda: get_bizmitra_insights(business),
+            today=timezone.localdate(),
+        ),
     }
 
     return render(request, "billing/bill_detail.html", context)
@@ -270,13 +307,16 @@ def bills_list_view(request):
     if mode and mode != "ALL":
         bills = bills.filter(payment__method=mode)
 
-    if from_date:
-        bills = bills.filter(created_at__date__gte=from_date)
-    if to_date:
-        bills = bills.filter(created_at__date__lte=to_date)
+    bills = filter_date_range(bills, from_date, to_date)
 
     if customer:
-        bills = bills.filter(customer_name__icontains=customer)
+        # A phone number or email finds the customer by key; anything else
+        # searches names.
+        key = customer_key(phone=customer, email=customer)
+        if key:
+            bills = bills.filter(customer__key=key)
+        else:
+            bills = bills.filter(customer_name__icontains=customer)
 
     context = {
         "bills": bills,
@@ -296,39 +336,29 @@ def download_bill_pdf(request, bill_id):
         is_deleted=False
     )
 
-    pdf_path = generate_invoice_pdf(bill, bill.business)
-    return FileResponse(open(pdf_path, "rb"), as_attachment=True)
+    pdf_path = get_invoice_pdf(bill, bill.business)
+    return FileResponse(
+        open(pdf_path, "rb"),
+        as_attachment=True,
+        filename=f"{invoice_file_stem(bill)}.pdf",
+    )
 
 
 
 def mark_bill_paid(request, bill_id):
-    bill = get_object_or_404(Bill, id=bill_id)
-    bill.payment_status = "PAID"
-    bill.save()
+    bill = get_object_or_404(Bill, id=bill_id, is_deleted=False)
+    mark_paid(bill)
+    invalidate_invoice_pdf(bill)
     return redirect("bill_detail", bill_id=bill.id)
 
 
 def filter_bills_by_date(request, queryset):
-    from_date = request.GET.get("from_date")
-    to_date = request.GET.get("to_date")
-
-    if from_date:
-        queryset = queryset.filter(created_at__date__gte=from_date)
-
-    if to_date:
-        queryset = queryset.filter(created_at__date__lte=to_date)
-
-    return queryset
-
+    return filter_bills_by_dates(
+        queryset,
+        request.GET.get("from_date"),
+        request.GET.get("to_date"),
+    )
 
-def extract_sheet_csv_url(sheet_url: str) -> str:
-    if "export?format=csv" in sheet_url:
-        return sheet_url
-    try:
-        sheet_id = sheet_url.split("/d/")[1].split("/")[0]
-        return f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv"
-    except Exception:
-        return sheet_url
 
 def import_google_sheet_view(request):
     if request.method != "POST":
@@ -344,59 +374,8 @@ def import_google_sheet_view(request):
         messages.error(request, "No sheet URL provided")
         return redirect("analytics")
 
-    try:
-        csv_url = extract_sheet_csv_url(sheet_url)
-        response = requests.get(csv_url)
-        response.raise_for_status()
-    except Exception as e:
-        messages.error(request, f"Invalid or private Google Sheet: {e}")
-        return redirect("analytics")
-
-    reader = csv.DictReader(StringIO(response.text))
-
-
-    reader.fieldnames = [h.strip().lower() for h in reader.fieldnames]
-
-
-    bills_created, errors = 0, []
-
-    for idx, row in enumerate(reader, start=1):
-        try:
-            qty = int(row["quantity"])
-            price = float(row["price"])
-            discount = float(row.get("discount", 0))
-            total = (qty * price) - discount
-
-            bill = Bill.objects.create(
-                business=business,
-                customer_name=row.get("customer_name") or "Imported (Google Sheet)",
-                customer_phone=row.get("customer_phone"),
-                customer_email=row.get("customer_email"),
-                subtotal=qty * price,
-                discount=discount,
-                total_amount=total,
-                payment_status=row.get("payment_status", "Pending"),
-                created_at=timezone.now(),
-            )
-
-            BillItem.objects.create(
-                bill=bill,
-                item_name=row["item_name"],
-                quantity=qty,
-                price=price,
-                total=qty * price,
-            )
-
-            bills_created += 1
-
-        except Exception as e:
-            errors.append(f"Row {idx} failed: {e}")
-            continue
-
-    if bills_created > 0:
-        messages.success(request, f"Imported {bills_created} rows successfully")
-    else:
-        messages.error(request, f"No rows imported. Errors: {errors[:3]}...")
+    enqueue_sheet_import(business, sheet_url)
+    messages.success(request, "Google Sheet import queued. Progress is shown below.")
 
     return redirect("analytics")
 
@@ -417,81 +396,32 @@ def import_csv_file_view(request):
         messages.error(request, "Please upload a CSV file")
         return redirect("analytics")
 
-    try:
-        decoded_file = csv_file.read().decode("utf-8").splitlines()
-        reader = csv.DictReader(decoded_file)
-        reader.fieldnames = [h.strip() for h in reader.fieldnames]
-    except Exception as e:
-        messages.error(request, f"Invalid CSV format: {e}")
-        return redirect("analytics")
-
-    bills_created = 0
-    failed_rows = []
-
-    year = timezone.now().year
-    business_name = business.name.replace(" ", "").upper()
-    sequence = Bill.objects.filter(business=business, created_at__year=year).count()
-
-    for row in reader:
-        try:
-            qty = int((row.get("quantity") or "0").strip())
-            price = float((row.get("price") or "0").strip())
-            total = qty * price
-            discount = float((row.get("discount") or "0").strip())
-
-            bill_date = None
-            if row.get("date"):
-                try:
-                    naive_date = datetime.strptime(row["date"].strip(), "%Y-%m-%d")
-                    bill_date = timezone.make_aware(naive_date, timezone.get_current_timezone())
-                except Exception as e:
-                    logger.warning(f"Invalid date in row {row}: {e}")
-                    bill_date = None
-
-            sequence += 1
-            bill_number = f"BS_{year}_{business_name}-{sequence:06d}"
-
-            bill = Bill.objects.create(
-                business=business,
-                bill_number=bill_number,
-                customer_name=(row.get("customer_name") or "Imported").strip(),
-                customer_phone=(row.get("customer_phone") or "").strip(),
-                customer_email=(row.get("customer_email") or "").strip(),
-                subtotal=total,
-                discount=discount,
-                total_amount=max(total - discount, 0),
-                payment_status=(row.get("payment_status") or "UNPAID").strip().upper(),
-                created_at=bill_date or timezone.now(),
-            )
+    enqueue_csv_import(business, csv_file)
+    messages.success(request, "CSV import queued. Progress is shown below.")
 
-            BillItem.objects.create(
-                bill=bill,
-                item_name=(row.get("item_name") or "").strip(),
-                quantity=qty,
-                price=price,
-                total=total,
-            )
-
-            if bill.payment_status == "PAID":
-                Payment.objects.create(
-                    bill=bill,
-                    method=(row.get("payment_mode") or "CASH").strip(),
-                    reference_id=None
-                )
+    return redirect("analytics")
 
-            bills_created += 1
 
-        except Exception as e:
-            failed_rows.append({"row": row, "error": str(e)})
-            logger.error(f"Row failed: {row} | Error: {e}")
-            continue
+def import_job_status_view(request, job_id):
+    business = get_current_business(request)
+    if not business:
+        return JsonResponse({"error": "Please login to continue"}, status=401)
 
-    if bills_created > 0:
-        messages.success(request, f"Imported {bills_created} rows successfully")
-    if failed_rows:
-        messages.warning(request, f"{len(failed_rows)} rows failed. Check logs for details.")
+    job = get_object_or_404(ImportJob, id=job_id, business=business)
 
-    return redirect("analytics")
+    return JsonResponse({
+        "id": job.id,
+        "source": job.source,
+        "status": job.status,
+        "progress": job.progress,
+        "total_rows": job.total_rows,
+        "rows_processed": job.rows_processed,
+        "bills_created": job.bills_created,
+        "skipped_count": job.skipped_count,
+        "failed_count": job.failed_count,
+        "errors": job.errors[:5],
+        "message": job.message,
+    })
 
 
 
@@ -504,14 +434,17 @@ def bulk_delete_bills_view(request):
     if request.method == "POST":
         bill_ids = request.POST.getlist("bill_ids")
         if bill_ids:
-            Bill.objects.filter(id__in=bill_ids, business=business).update(is_deleted=True)
-            messages.success(request, f"Deleted {len(bill_ids)} bills successfully")
+            deleted = delete_bills(business, bill_ids)
+            messages.success(request, f"Deleted {deleted} bills successfully")
         else:
             messages.warning(request, "No bills selected")
 
     return redirect("bills_list")
 
 
+PREVIEW_ROWS = 50
+
+
 def preview_import_view(request):
     business = get_current_business(request)
     if not business:
@@ -534,9 +467,8 @@ def preview_import_view(request):
 
         elif request.FILES.get("csv_file"):
             try:
-                decoded_file = request.FILES["csv_file"].read().decode("utf-8").splitlines()
-                reader = csv.DictReader(decoded_file)
-                rows = list(reader)
+                reader = open_csv_upload(request.FILES["csv_file"])
+                rows = list(islice(reader, PREVIEW_ROWS))
             except Exception:
                 messages.error(request, "Invalid CSV file")
                 return redirect("analytics")
@@ -590,36 +522,16 @@ def download_sales_excel(request):
     bills = Bill.objects.filter(business=business)
     bills = filter_bills_by_date(request, bills)
 
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Sales Report"
-
-    ws.append([
-        "Bill Number", "Date", "Customer",
-        "Subtotal", "Discount", "Total", "Status"
-    ])
-
-    for bill in bills:
-        ws.append([
-            bill.bill_number,
-            bill.created_at.strftime("%Y-%m-%d"),
-            bill.customer_name or "Walk-in",
-            float(bill.subtotal),
-            float(bill.discount),
-            float(bill.total_amount),
-            bill.payment_status,
-        ])
-
-    output = BytesIO()
-    wb.save(output)
+    output = tempfile.TemporaryFile()
+    write_sales_workbook(bills, output, include_items=request.GET.get("items") == "1")
     output.seek(0)
 
-    response = HttpResponse(
-        output.read(),
-        content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    return FileResponse(
+        output,
+        as_attachment=True,
+        filename=f"BS_{timezone.now().year}_{business.name}_sales.xlsx",
+        content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
     )
-    response["Content-Disposition"] = f'attachment; filename="BS_{timezone.now().year}_{business.name}_sales.xlsx"'
-    return response
 
 def download_sales_csv(request):
     business = get_current_business(request)
@@ -630,28 +542,86 @@ def download_sales_csv(request):
     bills = Bill.objects.filter(business=business)
     bills = filter_bills_by_date(request, bills)
 
-    response = HttpResponse(content_type="text/csv")
-    response["Content-Disposition"] = f'attachment; filename="BS_{timezone.now().year}_{business.name}_sales.csv"'
+    use_gzip = "gzip" in request.headers.get("Accept-Encoding", "")
 
-    writer = csv.writer(response)
-    writer.writerow([
-        "Bill Number", "Date", "Customer",
-        "Subtotal", "Discount", "Total", "Status"
-    ])
-
-    for bill in bills:
-        writer.writerow([
-            bill.bill_number,
-            bill.created_at.strftime("%Y-%m-%d"),
-            bill.customer_name or "Walk-in",
-            bill.subtotal,
-            bill.discount,
-            bill.total_amount,
-            bill.payment_status,
-        ])
+    response = StreamingHttpResponse(
+        iter_sales_csv(bills, gzip=use_gzip),
+        content_type="text/csv",
+    )
+    response["Content-Disposition"] = f'attachment; filename="BS_{timezone.now().year}_{business.name}_sales.csv"'
+    patch_vary_headers(response, ("Accept-Encoding",))
+    if use_gzip:
+        response["Content-Encoding"] = "gzip"
 
     return response
 
+def download_invoices_zip(request):
+    business = get_current_business(request)
+    if not business:
+        messages.error(request, "Please login to continue")
+        return redirect("onboarding")
+
+    bills = Bill.objects.filter(business=business, is_deleted=False)
+    bills = filter_bills_by_date(request, bills)
+
+    if bills.count() > SYNC_ZIP_MAX_BILLS:
+        enqueue_invoices_zip(business, request.GET.get("from_date"), request.GET.get("to_date"))
+        messages.success(request, "This export is large and is being generated. It will appear under Reports below.")
+        return redirect("analytics")
+
+    output = tempfile.TemporaryFile()
+    export_invoices_zip(bills, output, workers=1)
+    output.seek(0)
+
+    return FileResponse(
+        output,
+        as_attachment=True,
+        filename=f"BS_{timezone.now().year}_{business.name}_invoices.zip",
+        content_type="application/zip",
+    )
+
+def download_sales_parquet(request):
+    business = get_current_business(request)
+    if not business:
+        messages.error(request, "Please login to continue")
+        return redirect("onboarding")
+
+    bills = Bill.objects.filter(business=business)
+    bills = filter_bills_by_date(request, bills)
+
+    table = "items" if request.GET.get("table") == "items" else "bills"
+    write = write_items_parquet if table == "items" else write_bills_parquet
+
+    output = tempfile.TemporaryFile()
+    try:
+        write(bills, output)
+    except ImproperlyConfigured as e:
+        output.close()
+        messages.error(request, str(e))
+        return redirect("analytics")
+    output.seek(0)
+
+    return FileResponse(
+        output,
+        as_attachment=True,
+        filename=f"BS_{timezone.now().year}_{business.name}_{table}.parquet",
+        content_type="application/vnd.apache.parquet",
+    )
+
+def bill_changes_view(request):
+    business = get_current_business(request)
+    if not business:
+        return JsonResponse({"error": "Please login to continue"}, status=401)
+
+    try:
+        limit = int(request.GET.get("limit", CHANGE_FEED_PAGE_SIZE))
+        feed = get_changes(business, cursor=request.GET.get("cursor") or None, limit=limit)
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
+    return JsonResponse(feed)
+
+
 def download_sales_pdf(request):
     business = get_current_business(request)
     if not business:
@@ -661,36 +631,49 @@ def download_sales_pdf(request):
     bills = Bill.objects.filter(business=business)
     bills = filter_bills_by_date(request, bills)
 
+    if bills.count() > SYNC_REPORT_MAX_BILLS:
+        enqueue_sales_report(business, request.GET.get("from_date"), request.GET.get("to_date"))
+        messages.success(request, "This report is large and is being generated. It will appear under Reports below.")
+        return redirect("analytics")
+
     response = HttpResponse(content_type="application/pdf")
     response["Content-Disposition"] = f'attachment; filename="BS_{timezone.now().year}_{business.name}_sales.pdf"'
+    write_sales_report_pdf(business, bills, response)
 
-    doc = SimpleDocTemplate(response)
-    styles = getSampleStyleSheet()
-    elements = []
+    return response
 
-    elements.append(
-        Paragraph(
-            f"<b>BizSight Sales Report</b><br/>{business.name}",
-            styles["Title"],
-        )
-    )
-    elements.append(Spacer(1, 12))
 
-    table_data = [["Bill", "Date", "Customer", "Total", "Status"]]
+def report_job_status_view(request, job_id):
+    business = get_current_business(request)
+    if not business:
+        return JsonResponse({"error": "Please login to continue"}, status=401)
 
-    for bill in bills:
-        table_data.append([
-            bill.bill_number,
-            bill.created_at.strftime("%d-%m-%Y"),
-            bill.customer_name or "Walk-in",
-            f"₹{bill.total_amount}",
-            bill.payment_status,
-        ])
+    job = get_object_or_404(ReportJob, id=job_id, business=business)
 
-    elements.append(Table(table_data))
-    doc.build(elements)
+    return JsonResponse({
+        "id": job.id,
+        "status": job.status,
+        "bill_count": job.bill_count,
+        "message": job.message,
+        "download_url": reverse("download_report", args=[job.id]) if job.file else None,
+    })
 
-    return response
+
+def download_report_view(request, job_id):
+    business = get_current_business(request)
+    if not business:
+        messages.error(request, "Please login to continue")
+        return redirect("onboarding")
+
+    job = get_object_or_404(ReportJob, id=job_id, business=business, status="COMPLETED")
+    suffix, content_type = REPORT_FILES[job.kind]
+
+    return FileResponse(
+        job.file.open("rb"),
+        as_attachment=True,
+        filename=f"BS_{job.created_at.year}_{business.name}_{suffix}",
+        content_type=content_type,
+    )
 
 def delete_bill_view(request, bill_id):
     business = get_current_business(request)
@@ -702,9 +685,7 @@ def delete_bill_view(request, bill_id):
         is_deleted=False
     )
 
-    bill.is_deleted = True
-    bill.deleted_at = timezone.now()
-    bill.save(update_fields=["is_deleted", "deleted_at"])
+    delete_bills(business, [bill.id])
 
     messages.success(request, "Bill deleted")
     return redirect("bills_list")
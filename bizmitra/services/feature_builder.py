@@ -1,33 +1,28 @@
-from billing.models import Bill
-from django.db.models import Avg, Sum
+from analytics_engine.services.timeseries import load_sales_series
 from bizmitra.services.tf_risk_model import predict_risk
 
 def build_business_features(business):
-    bills = Bill.objects.filter(business=business, is_deleted=False)
+    # One load of the business's bills; every feature below is computed
+    # from the same arrays instead of a query each.
+    series = load_sales_series(business)
 
-    total_bills = bills.count()
-    unpaid_bills = bills.filter(payment_status__iexact="UNPAID").count()
+    total_bills = len(series)
+    paid_amounts = series.amounts[series.is_status("PAID")]
 
-    total_sales = bills.filter(payment_status__iexact="PAID").aggregate(
-        total=Sum("total_amount")
-    )["total"] or 0
+    total_sales = paid_amounts.sum() if paid_amounts.size else 0
+    avg_bill = paid_amounts.mean() if paid_amounts.size else 0
 
-    avg_bill = bills.filter(payment_status__iexact="PAID").aggregate(
-        avg=Avg("total_amount")
-    )["avg"] or 0
-
-    unpaid_ratio = unpaid_bills / total_bills if total_bills else 0
+    unpaid_ratio = int(series.is_status("UNPAID").sum()) / total_bills if total_bills else 0
 
     # Default sales trend
     sales_trend = "stable"
     if total_bills >= 2:
-        latest = bills.order_by("-created_at").first()
-        oldest = bills.order_by("created_at").first()
-        if latest and oldest:
-            if latest.total_amount > oldest.total_amount:
-                sales_trend = "upward"
-            elif latest.total_amount < oldest.total_amount:
-                sales_trend = "downward"
+        # The series is ordered by created_at: first is the oldest bill.
+        latest, oldest = series.amounts[-1], series.amounts[0]
+        if latest > oldest:
+            sales_trend = "upward"
+        elif latest < oldest:
+            sales_trend = "downward"
 
     # ✅ Use ML model for risk prediction
     features = {
@@ -1,16 +1,31 @@
 from django.shortcuts import render, redirect
 from accounts.utils import get_current_business
+from analytics_engine.services.cache import cached_result
+from analytics_engine.services.forecasting import HORIZONS, get_forecast
 from bizmitra.services.feature_builder import build_business_features
 from bizmitra.services.insight_engine import generate_insights
 import json
 
+def _dashboard_data(business):
+    features = build_business_features(business)
+    return features, generate_insights(features)
+
+
 def dashboard_view(request):
     business = get_current_business(request)
     if not business:
         return redirect("/accounts/login/")
 
-    features = build_business_features(business)
-    insights = generate_insights(features)
+    features, insights = cached_result(
+        business,
+        "bizmitra_dashboard",
+        lambda: _dashboard_data(business),
+    )
+
+    # Fitted offline by fit_sales_forecasts; this is only a read.
+    horizon = request.GET.get("horizon", "")
+    horizon = int(horizon) if horizon.isdigit() and int(horizon) in HORIZONS else HORIZONS[0]
+    forecast = get_forecast(business, horizon)
 
     return render(request, "bizmitra/dashboard.html", {
         "business": business,
@@ -18,4 +33,7 @@ def dashboard_view(request):
         "insights": insights,
         "features_json": json.dumps(features),
         "insights_json": json.dumps(insights),
+        "forecast": forecast,
+        "forecast_horizons": HORIZONS,
+        "horizon": horizon,
     })
\ No newline at end of file
@@ -124,3 +124,24 @@ EMAIL_HOST_PASSWORD = config("EMAIL_HOST_PASSWORD")
 DEFAULT_FROM_EMAIL = config("DEFAULT_FROM_EMAIL")
 
 BUSINESS_UPI_ID = config("BUSINESS_UPI_ID", default="test@upi")
+
+# Analytics results are cached per business and data version. Set
+# ANALYTICS_CACHE_DIR to share the cache between worker processes.
+ANALYTICS_CACHE_DIR = config("ANALYTICS_CACHE_DIR", default="")
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "analytics": (
+        {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": ANALYTICS_CACHE_DIR,
+        }
+        if ANALYTICS_CACHE_DIR
+        else {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "analytics",
+        }
+    ),
+}
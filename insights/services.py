@@ -1,47 +1,37 @@
 from django.utils import timezone
 from datetime import timedelta
 from billing.models import Bill
-from django.db.models import Sum, Count
+from django.db.models import Sum
+from analytics_engine.services.comparisons import compare_periods
+from analytics_engine.services.rollups import hourly_sales
 
 
 def get_bizmitra_insights(business):
-    today = timezone.now().date()
-    last_7_days = today - timedelta(days=7)
-    prev_7_days = today - timedelta(days=14)
+    today = timezone.localdate()
 
     insights = []
 
     # 1️⃣ Sales Trend
-    recent_sales = Bill.objects.filter(
-        business=business,
-        created_at__date__gte=last_7_days
-    ).aggregate(total=Sum("total_amount"))["total"] or 0
-
-    previous_sales = Bill.objects.filter(
-        business=business,
-        created_at__date__gte=prev_7_days,
-        created_at__date__lt=last_7_days
-    ).aggregate(total=Sum("total_amount"))["total"] or 0
+    week = compare_periods(business, today - timedelta(days=6), today, "previous")
 
-    if recent_sales < previous_sales:
+    if week.current.revenue < week.previous.revenue:
         insights.append(
             "📉 Sales have dropped compared to last week."
         )
 
     # 2️⃣ Peak Hour
     peak_hour = (
-        Bill.objects
-        .filter(business=business)
-        .extra(select={'hour': "strftime('%%H', created_at)"})
+        hourly_sales(business)
         .values('hour')
-        .annotate(count=Count('id'))
+        .annotate(count=Sum('bill_count'))
+        .filter(count__gt=0)
         .order_by('-count')
         .first()
     )
 
     if peak_hour:
         insights.append(
-            f"Most bills are generated around {peak_hour['hour']}:00 hrs."
+            f"Most bills are generated around {peak_hour['hour']:02d}:00 hrs."
         )
 
     # 3️⃣ Pay Later Risk